@@ -1,21 +1,26 @@
-import requests
-import json
+import os
+import sys
 from ollama import chat, ChatResponse
 from pydantic import BaseModel, Field
 
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))  # shared basics/ helpers
+from tool_dispatcher import ToolDispatcher
+from weather import WeatherClient, WeatherBatcher
+
 """
 reference: https://ollama.com/blog/tool-support
 """
 
 
+# Shared client: reuses pooled connections and caches results for nearby coordinates
+weather_client = WeatherClient(grid=0.01, ttl=600)
+# Calls made within 20ms of each other (one model turn or concurrent sessions) share one request
+weather_batcher = WeatherBatcher(weather_client, window=0.02)
+
 # Step 1: Define tools (functions) that we want to call
 def get_weather(latitude, longitude):
     """This is a publically available API that returns the weather for a given location."""
-    response = requests.get(
-        f"https://api.open-meteo.com/v1/forecast?latitude={latitude}&longitude={longitude}&current=temperature_2m,wind_speed_10m&hourly=temperature_2m,relative_humidity_2m,wind_speed_10m"
-    )
-    data = response.json()
-    return data["current"]
+    return weather_batcher.get_weather(latitude, longitude)
 
 # Define tools for model to use
 tools = [
@@ -61,26 +66,11 @@ print(response.model_dump())
 available_functions = {
     "get_weather": get_weather,
 }
+tool_dispatcher = ToolDispatcher(available_functions, timeout=10.0)
 
 # Step 3: Use args returned by model to perform actual function calls
-if response.message.tool_calls:
-    for tool in response.message.tool_calls: # multiple tools may be called in 1 response
-        if function_to_call := available_functions.get(tool.function.name):
-            """
-            ":=" is called walrus operator (introduced in Python 3.8). Allows assignment as part of an expression.
-            Equivalent code without ":=" :
-                function_to_call = available_functions.get(tool.function.name)
-                if function_to_call:
-            """
-            print('Calling function:', tool.function.name)
-            print('Arguments:', tool.function.arguments)
-            output = function_to_call(**tool.function.arguments) # ** used for dictionary unpacking
-            print('Function output:', output)
-            messages.append(
-                {"role": "tool", "tool_call_name": tool.function.name, "content": json.dumps(output)}
-            )
-        else:
-            print('Function', tool.function.name, 'not found')
+# multiple tools may be called in 1 response, they run concurrently and results keep the call order
+messages.extend(tool_dispatcher.dispatch(response.message.tool_calls))
  
 # Step 4: Supply model with result to get it in format that we want
 class WeatherResponse(BaseModel):
@@ -104,3 +94,5 @@ print("Final response:", response.message.content)
 weather = WeatherResponse.model_validate_json(response.message.content) # create object
 print(weather.temperature)
 print(weather.response)
+print("Weather cache:", weather_client.stats())
+print("Weather batching:", weather_batcher.stats())
\ No newline at end of file
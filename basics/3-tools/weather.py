@@ -0,0 +1,185 @@
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+import requests
+from requests.adapters import HTTPAdapter
+
+"""
+open-meteo client behind the get_weather tool.
+One pooled requests.Session is reused for every call (no TCP/TLS setup per call), and results are kept in a
+bounded LRU cache with a TTL, keyed on coordinates rounded to a grid, so nearby repeat lookups skip the API.
+WeatherBatcher coalesces lookups issued within a short window into one multi-location request.
+reference: https://open-meteo.com/en/docs
+"""
+
+FORECAST_URL = "https://api.open-meteo.com/v1/forecast"
+CURRENT_FIELDS = "temperature_2m,wind_speed_10m"
+HOURLY_FIELDS = "temperature_2m,relative_humidity_2m,wind_speed_10m"
+
+
+class WeatherClient:
+    """Pooled, cached access to the open-meteo forecast endpoint."""
+
+    def __init__(
+        self,
+        base_url: str = FORECAST_URL,  # point at a local stand-in server for testing
+        grid: float = 0.01,  # degrees, about 1km; coordinates in the same cell share a cache entry
+        ttl: float = 600.0,  # seconds a cached result stays fresh
+        max_entries: int = 1024,
+        pool_size: int = 10,
+        timeout: float = 10.0,
+    ):
+        self.base_url = base_url
+        self.grid = grid
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.timeout = timeout
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.cache = OrderedDict()  # (latitude, longitude) -> (expires at, current weather)
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def key(self, latitude: float, longitude: float) -> tuple[float, float]:
+        """Snap coordinates to the cache grid."""
+        return (
+            round(round(float(latitude) / self.grid) * self.grid, 6),
+            round(round(float(longitude) / self.grid) * self.grid, 6),
+        )
+
+    def _cached(self, key):
+        with self.lock:
+            entry = self.cache.get(key)
+            if entry is not None and entry[0] > time.monotonic():
+                self.cache.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            if entry is not None:
+                del self.cache[key]  # expired
+            self.misses += 1
+            return None
+
+    def _store(self, key, current: dict):
+        with self.lock:
+            self.cache[key] = (time.monotonic() + self.ttl, current)
+            self.cache.move_to_end(key)
+            while len(self.cache) > self.max_entries:
+                self.cache.popitem(last=False)  # evict the least recently used entry
+
+    def fetch(self, latitude, longitude) -> dict:
+        """Request the forecast for one point, bypassing the cache."""
+        return self.fetch_many([(latitude, longitude)])[0]
+
+    def fetch_many(self, points: list[tuple[float, float]]) -> list[dict]:
+        """Request the forecast for several points in one call, results in the order of points."""
+        response = self.session.get(
+            self.base_url,
+            params={
+                "latitude": ",".join(str(latitude) for latitude, _ in points),
+                "longitude": ",".join(str(longitude) for _, longitude in points),
+                "current": CURRENT_FIELDS,
+                "hourly": HOURLY_FIELDS,
+            },
+            timeout=self.timeout,
+        )
+        response.raise_for_status()
+        data = response.json()
+        # open-meteo answers a single location with an object and several locations with a list
+        locations = data if isinstance(data, list) else [data]
+        if len(locations) != len(points):
+            raise ValueError(f"Expected {len(points)} locations from open-meteo, got {len(locations)}")
+        return [location["current"] for location in locations]
+
+    def get_weather(self, latitude, longitude) -> dict:
+        """Current weather for the coordinates, served from the cache while it is fresh."""
+        key = self.key(latitude, longitude)
+        if (current := self._cached(key)) is not None:
+            return current
+        current = self.fetch(*key)
+        self._store(key, current)
+        return current
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+            "entries": len(self.cache),
+        }
+
+    def close(self):
+        self.session.close()
+
+
+class WeatherBatcher:
+    """Collects get_weather calls issued within `window` seconds and sends them as one request."""
+
+    def __init__(self, client: WeatherClient, window: float = 0.02, max_batch: int = 50):
+        self.client = client
+        self.window = window
+        self.max_batch = max_batch  # flush early once this many distinct locations are waiting
+        self.pending = {}  # grid key -> Future shared by every caller waiting on that location
+        self.lock = threading.Lock()
+        self.timer = None
+        self.calls = 0
+        self.requests_sent = 0
+
+    def get_weather(self, latitude, longitude) -> dict:
+        """Current weather for the coordinates, fetched together with other calls in the same window."""
+        key = self.client.key(latitude, longitude)
+        if (current := self.client._cached(key)) is not None:
+            return current
+        batch = None
+        with self.lock:
+            self.calls += 1
+            future = self.pending.get(key)
+            if future is None:
+                future = self.pending[key] = Future()
+                if len(self.pending) >= self.max_batch:
+                    batch = self._take()
+                elif self.timer is None:
+                    self.timer = threading.Timer(self.window, self._flush)
+                    self.timer.daemon = True
+                    self.timer.start()
+        if batch:
+            self._send(batch)
+        return future.result()
+
+    def _take(self) -> dict:
+        """Detach the pending batch (caller holds the lock)."""
+        batch, self.pending = self.pending, {}
+        if self.timer is not None:
+            self.timer.cancel()
+            self.timer = None
+        return batch
+
+    def _flush(self):
+        with self.lock:
+            batch = self._take()
+        if batch:
+            self._send(batch)
+
+    def _send(self, batch: dict):
+        keys = list(batch)
+        self.requests_sent += 1
+        try:
+            results = self.client.fetch_many(keys)
+        except Exception as e:
+            for future in batch.values():
+                future.set_exception(e)
+            return
+        for key, current in zip(keys, results):
+            self.client._store(key, current)
+            batch[key].set_result(current)
+
+    def stats(self) -> dict:
+        return {
+            "calls": self.calls,
+            "requests_sent": self.requests_sent,
+            "calls_per_request": self.calls / self.requests_sent if self.requests_sent else 0.0,
+        }
@@ -0,0 +1,50 @@
+import math
+from collections import Counter
+from typing import Optional
+from kb_index import tokenize
+
+"""
+Pre-LLM matcher for repeat FAQ questions.
+When the user question is (almost) the same as a record's question, the record can be
+returned directly and both chat() round trips are skipped.
+"""
+
+
+def cosine_similarity(a: str, b: str) -> float:
+    """Cosine similarity between the token counts of two strings (0 to 1)."""
+    a_terms, b_terms = Counter(tokenize(a)), Counter(tokenize(b))
+    dot = sum(count * b_terms[term] for term, count in a_terms.items())
+    norm = math.sqrt(sum(c * c for c in a_terms.values())) * math.sqrt(sum(c * c for c in b_terms.values()))
+    return dot / norm if norm else 0.0
+
+
+class FAQMatcher:
+    """Matches a question against the `question` field of the top index candidates."""
+
+    def __init__(self, index, threshold: float = 0.85, candidates: int = 5):
+        self.index = index  # anything with search(question, k) -> list of records
+        self.threshold = threshold
+        self.candidates = candidates
+        self.hits = 0
+        self.misses = 0
+
+    def match(self, question: str) -> Optional[dict]:
+        """Return the best record if its question is similar enough, otherwise None."""
+        best, best_score = None, 0.0
+        for record in self.index.search(question, k=self.candidates):
+            score = cosine_similarity(question, record["question"])
+            if score > best_score:
+                best, best_score = record, score
+        if best is not None and best_score >= self.threshold:
+            self.hits += 1
+            return best
+        self.misses += 1
+        return None
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+        }
@@ -0,0 +1,94 @@
+import heapq
+import json
+import math
+import re
+import threading
+from collections import Counter
+
+"""
+In-memory BM25 index over the knowledge base records.
+reference: https://en.wikipedia.org/wiki/Okapi_BM25
+"""
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+
+def tokenize(text: str) -> list[str]:
+    """Lowercase the text and split it into alphanumeric tokens."""
+    return TOKEN_PATTERN.findall(text.lower())
+
+
+class KBIndex:
+    """Inverted index built once at startup, answers top-k queries from memory."""
+
+    def __init__(self, records: list[dict], k1: float = 1.5, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self.records = {}  # record id -> record
+        self.postings = {}  # term -> {record id: term frequency}
+        self.doc_lengths = {}  # record id -> number of tokens
+        self.total_length = 0
+        self.lock = threading.Lock()  # searches never see a half-applied change
+        for record in records:
+            self._add(record)
+
+    @classmethod
+    def from_file(cls, path: str = "kb.json", **kwargs) -> "KBIndex":
+        """Load kb.json once and index every record in it."""
+        with open(path, "r") as f:
+            return cls(json.load(f)["records"], **kwargs)
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def _add(self, record: dict):
+        record_id = record["id"]
+        # The question is repeated so that matches on it outweigh matches in the answer
+        terms = Counter(tokenize(f"{record['question']} {record['question']} {record['answer']}"))
+        for term, frequency in terms.items():
+            self.postings.setdefault(term, {})[record_id] = frequency
+        self.records[record_id] = record
+        self.doc_lengths[record_id] = sum(terms.values())
+        self.total_length += self.doc_lengths[record_id]
+
+    def _remove(self, record_id):
+        record = self.records.pop(record_id)
+        for term in set(tokenize(f"{record['question']} {record['answer']}")):
+            postings = self.postings[term]
+            del postings[record_id]
+            if not postings:
+                del self.postings[term]
+        self.total_length -= self.doc_lengths.pop(record_id)
+
+    def apply_changes(self, upserts: list[dict], deletes: list):
+        """Insert or replace the upserted records and drop the deleted ids in place."""
+        with self.lock:
+            for record_id in deletes:
+                if record_id in self.records:
+                    self._remove(record_id)
+            for record in upserts:
+                if record["id"] in self.records:
+                    self._remove(record["id"])
+                self._add(record)
+
+    def search(self, question: str, k: int = 3) -> list[dict]:
+        """Return the k best matching records, highest BM25 score first."""
+        with self.lock:
+            return self._search(question, k)
+
+    def _search(self, question: str, k: int) -> list[dict]:
+        if not self.records:
+            return []
+        n = len(self.records)
+        avg_length = self.total_length / n
+        scores = {}
+        for term in set(tokenize(question)):
+            postings = self.postings.get(term)
+            if not postings:
+                continue
+            idf = math.log(1 + (n - len(postings) + 0.5) / (len(postings) + 0.5))
+            for record_id, frequency in postings.items():
+                norm = self.k1 * (1 - self.b + self.b * self.doc_lengths[record_id] / avg_length)
+                scores[record_id] = scores.get(record_id, 0.0) + idf * frequency * (self.k1 + 1) / (frequency + norm)
+        best = heapq.nlargest(k, scores.items(), key=lambda item: item[1])
+        return [self.records[record_id] for record_id, _ in best]
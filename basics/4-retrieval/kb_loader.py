@@ -0,0 +1,90 @@
+import json
+import os
+import threading
+
+"""
+Hot-reloading loader for kb.json.
+The file's mtime/size is watched (or reload() is called explicitly); records are diffed by id and only
+the inserts, updates and deletes are pushed to the subscribed indexes through apply_changes().
+"""
+
+
+class KBLoader:
+    """Keeps the in-memory records in sync with kb.json and notifies indexes of changes."""
+
+    def __init__(self, path: str = "kb.json"):
+        self.path = path
+        self.records = {}  # record id -> record
+        self.indexes = []  # objects with apply_changes(upserts, deletes)
+        self._signature = None  # (mtime, size) of the last loaded file
+        self._reload_lock = threading.Lock()  # one reload at a time
+        self._stop = threading.Event()
+        self._watcher = None
+        self.reload()
+
+    def subscribe(self, index):
+        """Register an index that should receive every change from now on."""
+        self.indexes.append(index)
+
+    def _stat(self):
+        stat = os.stat(self.path)
+        return stat.st_mtime_ns, stat.st_size
+
+    def changed(self) -> bool:
+        """Cheap check whether kb.json was modified since the last load."""
+        return self._stat() != self._signature
+
+    def reload(self, force: bool = False) -> dict:
+        """Re-read kb.json if it changed and apply the difference to every subscribed index."""
+        with self._reload_lock:
+            signature = self._stat()
+            if not force and signature == self._signature:
+                return {"inserted": 0, "updated": 0, "deleted": 0}
+            with open(self.path, "r") as f:
+                new_records = {record["id"]: record for record in json.load(f)["records"]}
+
+            inserted = [record for record_id, record in new_records.items() if record_id not in self.records]
+            updated = [
+                record
+                for record_id, record in new_records.items()
+                if record_id in self.records and self.records[record_id] != record
+            ]
+            deleted = [record_id for record_id in self.records if record_id not in new_records]
+
+            if inserted or updated or deleted:
+                for index in self.indexes:
+                    index.apply_changes(inserted + updated, deleted)
+            self.records = new_records
+            self._signature = signature
+            changes = {"inserted": len(inserted), "updated": len(updated), "deleted": len(deleted)}
+            if self.indexes and any(changes.values()):
+                print("Knowledge base reloaded:", changes)
+            return changes
+
+    def refresh(self) -> dict:
+        """Reload only when the file's mtime/size changed."""
+        if self.changed():
+            return self.reload()
+        return {"inserted": 0, "updated": 0, "deleted": 0}
+
+    def watch(self, interval: float = 2.0):
+        """Poll kb.json in a background thread so queries never wait for a reload."""
+        if self._watcher is not None:
+            return
+
+        def poll():
+            while not self._stop.wait(interval):
+                try:
+                    self.refresh()
+                except (OSError, ValueError, KeyError) as e:
+                    # The file may be caught mid-write, the next poll picks up the finished version
+                    print("Knowledge base reload skipped:", e)
+
+        self._watcher = threading.Thread(target=poll, daemon=True)
+        self._watcher.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._watcher is not None:
+            self._watcher.join()
+            self._watcher = None
@@ -0,0 +1,187 @@
+import json
+import os
+import sqlite3
+import threading
+from typing import Iterator
+from kb_index import tokenize
+
+"""
+SQLite FTS5 storage for knowledge bases too large to hold in memory.
+kb.json is streamed into the database record by record, queries are ranked with FTS5's bm25().
+reference: https://www.sqlite.org/fts5.html
+"""
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+CREATE TABLE IF NOT EXISTS records (
+    id INTEGER PRIMARY KEY,
+    question TEXT NOT NULL,
+    answer TEXT NOT NULL,
+    generation INTEGER NOT NULL
+);
+CREATE VIRTUAL TABLE IF NOT EXISTS records_fts USING fts5(
+    question, answer, content='records', content_rowid='id'
+);
+CREATE TRIGGER IF NOT EXISTS records_ai AFTER INSERT ON records BEGIN
+    INSERT INTO records_fts(rowid, question, answer) VALUES (new.id, new.question, new.answer);
+END;
+CREATE TRIGGER IF NOT EXISTS records_ad AFTER DELETE ON records BEGIN
+    INSERT INTO records_fts(records_fts, rowid, question, answer) VALUES ('delete', old.id, old.question, old.answer);
+END;
+CREATE TRIGGER IF NOT EXISTS records_au AFTER UPDATE ON records
+WHEN old.question IS NOT new.question OR old.answer IS NOT new.answer BEGIN
+    INSERT INTO records_fts(records_fts, rowid, question, answer) VALUES ('delete', old.id, old.question, old.answer);
+    INSERT INTO records_fts(rowid, question, answer) VALUES (new.id, new.question, new.answer);
+END;
+"""
+
+UPSERT = """
+INSERT INTO records (id, question, answer, generation) VALUES (?, ?, ?, ?)
+ON CONFLICT(id) DO UPDATE SET
+    question = excluded.question, answer = excluded.answer, generation = excluded.generation
+"""
+
+
+def iter_records(path: str, chunk_size: int = 1 << 16) -> Iterator[dict]:
+    """Yield the items of the top-level "records" array one at a time, without loading the whole file."""
+    decoder = json.JSONDecoder()
+    with open(path, "r") as f:
+        buffer, eof = "", False
+
+        def read_more() -> bool:
+            nonlocal buffer, eof
+            chunk = f.read(chunk_size)
+            eof = not chunk
+            buffer += chunk
+            return not eof
+
+        # Skip ahead to the opening bracket of the records array
+        while (start := buffer.find('"records"')) < 0:
+            buffer = buffer[-len('"records"'):]
+            if not read_more():
+                raise ValueError(f'No "records" array in {path}')
+        # start stays on "records", so a bracket in a later chunk is still found
+        while (bracket := buffer.find("[", start)) < 0:
+            if not read_more():
+                raise ValueError(f'No "records" array in {path}')
+        buffer, position = buffer[bracket + 1 :], 0
+
+        while True:
+            while position < len(buffer) and buffer[position] in " \t\r\n,":
+                position += 1
+            if position == len(buffer):
+                buffer, position = "", 0
+                if not read_more():
+                    raise ValueError(f"Unterminated records array in {path}")
+                continue
+            if buffer[position] == "]":
+                return
+            try:
+                record, position = decoder.raw_decode(buffer, position)
+            except json.JSONDecodeError:
+                # The record is cut off at the end of the buffer, keep its start and read more
+                buffer, position = buffer[position:], 0
+                if not read_more():
+                    raise
+                continue
+            yield record
+
+
+class SQLiteKB:
+    """Knowledge base stored in SQLite, searched through an FTS5 index with bounded memory."""
+
+    def __init__(self, db_path: str = "kb.sqlite", cache_kib: int = 16 * 1024):
+        self.db_path = db_path
+        self.cache_kib = cache_kib  # page cache per connection, keeps memory flat as the KB grows
+        self._local = threading.local()  # one connection per thread
+        with self.connection() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")  # readers keep working during an import
+            conn.executescript(SCHEMA)
+
+    @classmethod
+    def from_file(cls, path: str = "kb.json", **kwargs) -> "SQLiteKB":
+        """Open the database and import kb.json unless it is already up to date."""
+        kb = cls(**kwargs)
+        kb.refresh(path)
+        return kb
+
+    def connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path)
+            conn.execute(f"PRAGMA cache_size=-{self.cache_kib}")
+            self._local.conn = conn
+        return conn
+
+    def __len__(self) -> int:
+        return self.connection().execute("SELECT COUNT(*) FROM records").fetchone()[0]
+
+    def _meta(self, key: str):
+        row = self.connection().execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def refresh(self, path: str = "kb.json") -> bool:
+        """Re-import kb.json only when its mtime/size differ from the last import."""
+        stat = os.stat(path)
+        signature = f"{stat.st_mtime_ns}:{stat.st_size}"
+        if self._meta("source_signature") == signature:
+            return False
+        self.import_json(path)
+        with self.connection() as conn:
+            conn.execute("INSERT OR REPLACE INTO meta VALUES ('source_signature', ?)", (signature,))
+        return True
+
+    def import_json(self, path: str, batch_size: int = 1000):
+        """Stream kb.json into the database, then drop records that are no longer in the file."""
+        conn = self.connection()
+        generation = int(self._meta("generation") or 0) + 1
+        count = 0
+        with conn:  # one transaction, readers see either the old or the new knowledge base
+            batch = []
+            for record in iter_records(path):
+                batch.append((record["id"], record["question"], record["answer"], generation))
+                if len(batch) >= batch_size:
+                    conn.executemany(UPSERT, batch)
+                    count += len(batch)
+                    batch = []
+            conn.executemany(UPSERT, batch)
+            count += len(batch)
+            conn.execute("DELETE FROM records WHERE generation < ?", (generation,))
+            conn.execute("INSERT OR REPLACE INTO meta VALUES ('generation', ?)", (str(generation),))
+        print(f"SQLite knowledge base imported: {count} records")
+
+    def apply_changes(self, upserts: list[dict], deletes: list):
+        """Apply record changes in one transaction (same interface as the in-memory indexes)."""
+        generation = int(self._meta("generation") or 0)
+        with self.connection() as conn:
+            conn.executemany("DELETE FROM records WHERE id = ?", [(record_id,) for record_id in deletes])
+            conn.executemany(
+                UPSERT, [(r["id"], r["question"], r["answer"], generation) for r in upserts]
+            )
+
+    def search(self, question: str, k: int = 3) -> list[dict]:
+        """Return the k best matching records, question matches weighted above answer matches."""
+        terms = tokenize(question)
+        if not terms:
+            return []
+        query = " OR ".join(f'"{term}"' for term in dict.fromkeys(terms))
+        rows = self.connection().execute(
+            """
+            SELECT records.id, records.question, records.answer
+            FROM records_fts JOIN records ON records.id = records_fts.rowid
+            WHERE records_fts MATCH ?
+            ORDER BY bm25(records_fts, 2.0, 1.0)
+            LIMIT ?
+            """,
+            (query, k),
+        )
+        return [{"id": row[0], "question": row[1], "answer": row[2]} for row in rows]
+
+
+if __name__ == "__main__":
+    # Self-check: the streaming decoder must agree with json.load whatever the chunk boundaries are
+    with open("kb.json", "r") as f:
+        expected = json.load(f)["records"]
+    for chunk_size in [1, 2, 3, 5, 8, 13, 16, 64, 1 << 16]:
+        assert list(iter_records("kb.json", chunk_size=chunk_size)) == expected, f"chunk_size={chunk_size}"
+    print(f"iter_records matches json.load for {len(expected)} records at every chunk size")
@@ -1,15 +1,46 @@
-import json
+import os
+import sys
 from ollama import chat, ChatResponse
 from pydantic import BaseModel, Field
+from kb_index import KBIndex
+from kb_loader import KBLoader
+from faq_matcher import FAQMatcher
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))  # shared basics/ helpers
+from tool_dispatcher import ToolDispatcher
+
+# "keyword" uses the BM25 index, "dense" uses the persisted embedding index,
+# "sqlite" serves very large KBs from an FTS5 database with bounded memory
+SEARCH_MODE = "keyword"
+
+if SEARCH_MODE == "sqlite":
+    from kb_sqlite import SQLiteKB
+
+    # kb.json is streamed into kb.sqlite, later startups skip the import while the file is unchanged
+    kb_index = SQLiteKB.from_file("kb.json")
+else:
+    # Load kb.json once; edits to the file are applied to the index incrementally in the background
+    kb_loader = KBLoader("kb.json")
+
+    # Build the knowledge base index once at startup instead of reading kb.json on every tool call
+    if SEARCH_MODE == "dense":
+        from vector_index import VectorIndex
+
+        kb_index = VectorIndex(quantize=False)
+        kb_index.build(list(kb_loader.records.values()))
+    else:
+        kb_index = KBIndex(kb_loader.records.values())
+
+    kb_loader.subscribe(kb_index)
+    kb_loader.watch(interval=2.0)
 
 # Define knowledge base retrieval tool
-def search_kb(question: str):
+def search_kb(question: str, k: int = 3):
     """
-    Load the whole knowledge base from the JSON file.
-    (This is a mock function for demonstration purposes, we don't search)
+    Search the knowledge base index for the question.
+    Only the top-k records (with their ids) are returned, so the tool output stays small as the KB grows.
     """
-    with open("kb.json", "r") as f:
-        return json.load(f)
+    return {"records": kb_index.search(question, k=k)}
 
 # Call model with tool
 tools = [
@@ -33,58 +64,60 @@ tools = [
 
 system_prompt = "You are a helpful assistant that answers questions from the knowledge base about our e-commerce store."
 
-messages = [
-    {"role": "system", "content": system_prompt},
-    {"role": "user", "content": "What is the return policy?"},
-]
-
-# Model makes decision whether to call function
-response: ChatResponse = chat(
-    model="llama3.1",
-    messages=messages,
-    tools=tools,
-)
-
-print(response.model_dump())
-
 # Get args returned from model to call function
 available_functions = {
     "search_kb": search_kb,
 }
+tool_dispatcher = ToolDispatcher(available_functions, timeout=10.0)
 
-if response.message.tool_calls:
-    for tool in response.message.tool_calls: # multiple tools may be called in 1 response
-        if function_to_call := available_functions.get(tool.function.name):
-            """
-            ":=" is called walrus operator (introduced in Python 3.8). Allows assignment as part of an expression.
-            Equivalent code without ":=" :
-                function_to_call = available_functions.get(tool.function.name)
-                if function_to_call:
-            """
-            print('Calling function:', tool.function.name)
-            print('Arguments:', tool.function.arguments)
-            output = function_to_call(**tool.function.arguments) # ** used for dictionary unpacking
-            print('Function output:', output)
-            messages.append(
-                {"role": "tool", "tool_call_name": tool.function.name, "content": json.dumps(output)}
-            )
-        else:
-            print('Function', tool.function.name, 'not found')
-
-# Supply result to model to get it in desired format
 class KBResponse(BaseModel):
     answer: str = Field(description="The answer to the user's question.")
     source: int = Field(description="The record id of the answer.")
 
-response: ChatResponse = chat(
-    model="llama3.1",
-    messages=messages,
-    tools = tools,
-    format=KBResponse.model_json_schema(),
-)
+# Repeat FAQ questions are answered straight from the index, without calling the model
+faq_matcher = FAQMatcher(kb_index, threshold=0.85)
+
+def answer_question(question: str) -> KBResponse:
+    """Return a KB hit directly when the question matches a record, otherwise ask the model with the tool"""
+    if record := faq_matcher.match(question):
+        print("FAQ match:", record["id"], faq_matcher.stats())
+        return KBResponse(answer=record["answer"], source=record["id"])
+    print("FAQ miss:", faq_matcher.stats())
+
+    messages = [
+        {"role": "system", "content": system_prompt},
+        {"role": "user", "content": question},
+    ]
+
+    # Model makes decision whether to call function
+    response: ChatResponse = chat(
+        model="llama3.1",
+        messages=messages,
+        tools=tools,
+    )
+
+    print(response.model_dump())
+
+    # multiple tools may be called in 1 response, they run concurrently and results keep the call order
+    messages.extend(tool_dispatcher.dispatch(response.message.tool_calls))
+
+    # Supply result to model to get it in desired format
+    response: ChatResponse = chat(
+        model="llama3.1",
+        messages=messages,
+        tools = tools,
+        format=KBResponse.model_json_schema(),
+    )
+
+    print("Final response:", response.message.content)
+    return KBResponse.model_validate_json(response.message.content) # create object
+
+kb_response = answer_question("What is the return policy?")
+print(kb_response.answer)
+print(kb_response.source)
 
-print("Final response:", response.message.content)
-kb_response = KBResponse.model_validate_json(response.message.content) # create object
+# Rephrased question misses the FAQ matcher and goes through the tool-calling flow
+kb_response = answer_question("Can I get my money back if I don't like what I bought?")
 print(kb_response.answer)
 print(kb_response.source)
 
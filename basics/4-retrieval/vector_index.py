@@ -0,0 +1,166 @@
+import hashlib
+import json
+import os
+import threading
+import numpy as np
+from ollama import embed
+
+"""
+Dense retrieval over the knowledge base records.
+The embeddings are persisted as a memory-mapped .npy matrix next to a small JSON manifest,
+so a restart only re-embeds records whose text changed.
+reference: https://ollama.com/blog/embedding-models
+"""
+
+
+def record_text(record: dict) -> str:
+    return f"{record['question']}\n{record['answer']}"
+
+
+def record_hash(record: dict) -> str:
+    return hashlib.sha1(record_text(record).encode("utf-8")).hexdigest()
+
+
+def normalize(vectors: np.ndarray) -> np.ndarray:
+    """Scale rows to unit length so that a dot product is the cosine similarity."""
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    return vectors / np.maximum(norms, 1e-12)
+
+
+class VectorIndex:
+    """Embedding matrix on disk, searched with one vectorized dot product per query."""
+
+    def __init__(
+        self,
+        index_path: str = "kb_vectors",
+        model: str = "nomic-embed-text",
+        quantize: bool = False,
+        batch_size: int = 64,
+    ):
+        self.matrix_path = f"{index_path}.npy"
+        self.scales_path = f"{index_path}.scales.npy"
+        self.manifest_path = f"{index_path}.json"
+        self.model = model
+        self.quantize = quantize  # store int8 rows plus one float32 scale per row
+        self.batch_size = batch_size
+        self.records = {}  # record id -> record
+        self.ids = []  # row -> record id
+        self.matrix = None
+        self.scales = None
+        self.lock = threading.Lock()  # guards swapping in a rebuilt matrix
+
+    @classmethod
+    def from_file(cls, path: str = "kb.json", **kwargs) -> "VectorIndex":
+        """Load kb.json and bring the persisted embeddings up to date with it."""
+        with open(path, "r") as f:
+            records = json.load(f)["records"]
+        index = cls(**kwargs)
+        index.build(records)
+        return index
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def embed(self, texts: list[str]) -> np.ndarray:
+        """Embed texts in batches, returning unit-length float32 rows."""
+        vectors = []
+        for start in range(0, len(texts), self.batch_size):
+            response = embed(model=self.model, input=texts[start : start + self.batch_size])
+            vectors.extend(response.embeddings)
+        return normalize(np.asarray(vectors, dtype=np.float32))
+
+    def _load_manifest(self) -> dict:
+        try:
+            with open(self.manifest_path, "r") as f:
+                manifest = json.load(f)
+        except FileNotFoundError:
+            return {}
+        if manifest.get("model") != self.model or manifest.get("quantize") != self.quantize:
+            return {}  # persisted vectors are not compatible, embed everything again
+        return manifest
+
+    def _open(self):
+        matrix = np.load(self.matrix_path, mmap_mode="r")
+        scales = np.load(self.scales_path, mmap_mode="r") if self.quantize else None
+        return matrix, scales
+
+    def build(self, records: list[dict]):
+        """Write the embedding matrix for records, reusing rows whose id and text are unchanged."""
+        manifest = self._load_manifest()
+        previous_rows = {}
+        matrix = scales = None
+        if manifest and os.path.exists(self.matrix_path):
+            matrix, scales = self._open()
+        if manifest and matrix is not None and matrix.shape[0] == len(manifest["ids"]):
+            previous_rows = {
+                (record_id, text_hash): row
+                for row, (record_id, text_hash) in enumerate(zip(manifest["ids"], manifest["hashes"]))
+            }
+
+        hashes = [record_hash(record) for record in records]
+        stale = [
+            i for i, record in enumerate(records) if (record["id"], hashes[i]) not in previous_rows
+        ]
+        fresh = self.embed([record_text(records[i]) for i in stale]) if stale else None
+        fresh_rows = {i: n for n, i in enumerate(stale)}
+
+        dimensions = fresh.shape[1] if fresh is not None else matrix.shape[1] if matrix is not None else 0
+        vectors = np.empty((len(records), dimensions), dtype=np.float32)
+        for i, record in enumerate(records):
+            if i in fresh_rows:
+                vectors[i] = fresh[fresh_rows[i]]
+                continue
+            row = previous_rows[(record["id"], hashes[i])]
+            if self.quantize:
+                vectors[i] = matrix[row].astype(np.float32) * scales[row]
+            else:
+                vectors[i] = matrix[row]
+        ids = [record["id"] for record in records]
+        self._write(vectors, {"model": self.model, "quantize": self.quantize, "ids": ids, "hashes": hashes})
+
+        # Readers keep using the previous mapping until the new state is swapped in whole
+        matrix, scales = self._open()
+        with self.lock:
+            self.records = {record["id"]: record for record in records}
+            self.ids = ids
+            self.matrix, self.scales = matrix, scales
+        print(f"Vector index ready: {len(records)} records, {len(stale)} embedded")
+
+    def apply_changes(self, upserts: list[dict], deletes: list):
+        """Rebuild with the changed records, only the upserted ones are embedded again."""
+        records = dict(self.records)
+        for record_id in deletes:
+            records.pop(record_id, None)
+        for record in upserts:
+            records[record["id"]] = record
+        self.build(list(records.values()))
+
+    def _write(self, vectors: np.ndarray, manifest: dict):
+        # Write to temporary files first so a crash never leaves a half-written index behind
+        if self.quantize:
+            scales = np.maximum(np.abs(vectors).max(axis=1), 1e-12) / 127
+            matrix = np.round(vectors / scales[:, None]).astype(np.int8)
+            np.save(f"{self.scales_path}.tmp.npy", scales.astype(np.float32))
+            os.replace(f"{self.scales_path}.tmp.npy", self.scales_path)
+        else:
+            matrix = vectors
+        np.save(f"{self.matrix_path}.tmp.npy", matrix)
+        os.replace(f"{self.matrix_path}.tmp.npy", self.matrix_path)
+        with open(f"{self.manifest_path}.tmp", "w") as f:
+            json.dump(manifest, f)
+        os.replace(f"{self.manifest_path}.tmp", self.manifest_path)
+
+    def search(self, question: str, k: int = 3) -> list[dict]:
+        """Return the k records closest to the question, most similar first."""
+        with self.lock:
+            records, ids, matrix, scales = self.records, self.ids, self.matrix, self.scales
+        if not ids:
+            return []
+        query = self.embed([question])[0]
+        scores = matrix @ query
+        if scales is not None:
+            scores = scores * scales
+        k = min(k, len(scores))
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        return [records[ids[row]] for row in top]
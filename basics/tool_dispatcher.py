@@ -0,0 +1,54 @@
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError
+
+"""
+Runs the tool calls of one model response concurrently.
+The model may ask for several tools in one turn (e.g. the weather in three cities); running them on a
+thread pool makes the turn cost the slowest call instead of the sum of all calls.
+"""
+
+
+class ToolDispatcher:
+    """Dispatch tool calls from an `available_functions` mapping on a shared thread pool."""
+
+    def __init__(self, available_functions: dict, timeout: float = 10.0, max_workers: int = 8):
+        self.available_functions = available_functions
+        self.timeout = timeout  # seconds each call may take before its result is reported as an error
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="tool")
+
+    def dispatch(self, tool_calls) -> list[dict]:
+        """Run all calls concurrently and return their `role: tool` messages in the original call order."""
+        submitted = []
+        for tool in tool_calls or []:
+            if function_to_call := self.available_functions.get(tool.function.name):
+                """
+                ":=" is called walrus operator (introduced in Python 3.8). Allows assignment as part of an expression.
+                Equivalent code without ":=" :
+                    function_to_call = self.available_functions.get(tool.function.name)
+                    if function_to_call:
+                """
+                print('Calling function:', tool.function.name)
+                print('Arguments:', tool.function.arguments)
+                future = self.executor.submit(function_to_call, **tool.function.arguments) # ** used for dictionary unpacking
+                submitted.append((tool, future, time.monotonic() + self.timeout))
+            else:
+                print('Function', tool.function.name, 'not found')
+
+        messages = []
+        for tool, future, deadline in submitted:
+            try:
+                output = future.result(timeout=max(0.0, deadline - time.monotonic()))
+            except TimeoutError:
+                future.cancel()  # only stops calls that have not started yet
+                output = {"error": f"{tool.function.name} timed out after {self.timeout}s"}
+            except Exception as e:
+                output = {"error": f"{tool.function.name} failed: {e}"}
+            print('Function output:', output)
+            messages.append(
+                {"role": "tool", "tool_call_name": tool.function.name, "content": json.dumps(output)}
+            )
+        return messages
+
+    def shutdown(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
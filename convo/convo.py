@@ -1,19 +1,26 @@
 import ollama
 import time
+from history import ConversationHistory
+from session import DebateSession
 
 # Define the debate setup
 AGENT_1_ROLE = "A philosopher who strongly argues for the existence of God. Your goal is to convince your opponent that God exists using logic, philosophy, and evidence."
 AGENT_2_ROLE = "A skeptical scientist who strongly argues against the existence of God. Your goal is to refute your opponent's arguments and prove that God does not exist."
 
-# Initialize messages with system prompt
-messages = [
-    {"role": "system", "content": "Two AI agents will debate furiously over the existence of God. They will take turns presenting arguments and counterarguments. Please include anger in the argument."},
-]
+SYSTEM_PROMPT = "Two AI agents will debate furiously over the existence of God. They will take turns presenting arguments and counterarguments. Please include anger in the argument."
 
 # Define agent identities
 agent_1 = {"role": "assistant", "name": "Philosopher", "persona": AGENT_1_ROLE}
 agent_2 = {"role": "assistant", "name": "Scientist", "persona": AGENT_2_ROLE}
 
+# "history": one system prompt per request, the last turns verbatim and a running summary of the rest,
+#            kept under a token budget so late rounds cost as much prefill as early ones
+# "session": an append-only prompt per speaker with the model pinned, so each turn only prefills new tokens
+MODE = "history"
+
+history = ConversationHistory(system_prompt=SYSTEM_PROMPT, token_budget=2048, keep_turns=4)
+session = DebateSession(SYSTEM_PROMPT, [agent_1, agent_2], keep_alive="30m")
+
 # Number of debate rounds
 rounds = 5
 
@@ -23,28 +30,40 @@ current_speaker = agent_1
 for i in range(rounds):
     print(f"\n🔹 ROUND {i+1}: {current_speaker['name']} speaks 🔹\n")
 
-    # Add the current speaker's persona to guide the response
-    messages.append({"role": "system", "content": current_speaker["persona"]})
+    if MODE == "session":
+        # The session keeps every speaker's prompt itself and logs the prefill reuse of the turn
+        stream = session.turn(current_speaker["name"])
+    else:
+        # Build the prompt with the current speaker's persona to guide the response
+        messages = history.messages_for(current_speaker)
 
-    # Get response from Ollama
-    stream = ollama.chat(
-        model="llama3.1",
-        messages=messages,
-        stream=True  # Enable streaming for real-time output
-    )
+        # Get response from Ollama
+        stream = (
+            chunk["message"]["content"]
+            for chunk in ollama.chat(
+                model="llama3.1",
+                messages=messages,
+                stream=True  # Enable streaming for real-time output
+            )
+        )
 
     # Display response in real-time
     response_content = ""
-    for chunk in stream:
-        text = chunk["message"]["content"]
+    for text in stream:
         response_content += text
         print(text, end="", flush=True)
         time.sleep(0.02)  # Simulate real-time "thinking"
 
     print("\n" + "-" * 80)
 
-    # Add response to chat history
-    messages.append({"role": "assistant", "content": response_content})
+    # Add response to chat history, folding old turns into the summary if needed
+    if MODE != "session":
+        history.add_turn(current_speaker["name"], response_content)
 
     # Switch turns between the Philosopher and Scientist
     current_speaker = agent_2 if current_speaker == agent_1 else agent_1
+
+if MODE == "session":
+    session.unload()
+else:
+    print(f"History: {history.stats()}")
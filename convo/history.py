@@ -0,0 +1,113 @@
+import ollama
+
+"""
+Token-budgeted debate history: the last few turns verbatim, older turns folded into a running summary.
+"""
+
+SUMMARY_PROMPT = """You keep the running summary of a debate.
+Update the summary with the new turns below. Keep each side's main arguments and any points conceded.
+Answer with the updated summary only, at most {max_words} words.
+
+Current summary:
+{summary}
+
+New turns:
+{turns}"""
+
+
+def estimate_tokens(text: str, chars_per_token: float = 4.0) -> int:
+    """Rough token count; Ollama has no tokenize endpoint, about 4 characters per token for English."""
+    return int(len(text) / chars_per_token) + 1
+
+
+class ConversationHistory:
+    """Builds each speaker's prompt from the topic, one persona, a running summary and the last keep_turns turns.
+
+    Turns older than that are folded into the summary fold_batch at a time (one small LLM call per batch),
+    and more are folded whenever the prompt would exceed token_budget, so the prompt size stays flat.
+    """
+
+    def __init__(
+        self,
+        system_prompt: str,
+        token_budget: int = 2048,
+        keep_turns: int = 4,
+        fold_batch: int = 4,
+        summary_words: int = 200,
+        model: str = "llama3.1",
+    ):
+        self.system_prompt = system_prompt
+        self.token_budget = token_budget
+        self.keep_turns = keep_turns
+        self.fold_batch = fold_batch
+        self.summary_words = summary_words
+        self.model = model
+        self.summary = ""
+        self.turns = []  # (speaker name, content), oldest first, not yet folded into the summary
+        self.folded = 0  # number of turns in the summary
+
+    def add_turn(self, speaker: str, content: str):
+        self.turns.append((speaker, content))
+        self.compact()
+
+    def messages_for(self, speaker: dict) -> list[dict]:
+        """Prompt for the next turn of speaker: their own turns as assistant, the opponent's as user."""
+        system = f"{self.system_prompt}\n\nYou are the {speaker['name']}. {speaker['persona']}"
+        if self.summary:
+            system += f"\n\nSummary of the debate so far:\n{self.summary}"
+        messages = [{"role": "system", "content": system}]
+        for name, content in self.turns:
+            if name == speaker["name"]:
+                messages.append({"role": "assistant", "content": content})
+            else:
+                messages.append({"role": "user", "content": f"{name}: {content}"})
+        return messages
+
+    def token_count(self) -> int:
+        """Estimated tokens of the prompt, excluding the persona (the same size for every speaker)."""
+        text = self.system_prompt + self.summary + "".join(content for _, content in self.turns)
+        return estimate_tokens(text)
+
+    def compact(self):
+        """Fold old turns into the summary until the history fits the budget."""
+        fold = 0
+        if len(self.turns) - self.keep_turns >= self.fold_batch:
+            fold = len(self.turns) - self.keep_turns
+        if self.token_count() > self.token_budget:
+            # Over budget: fold everything but the last keep_turns, and the last turns too if still needed
+            fold = max(fold, len(self.turns) - self.keep_turns, 1)
+            while fold < len(self.turns) - 1 and self._tokens_after_fold(fold) > self.token_budget:
+                fold += 1
+        if fold > 0:
+            self._fold(self.turns[:fold])
+            self.turns = self.turns[fold:]
+
+    def _tokens_after_fold(self, fold: int) -> int:
+        remaining = "".join(content for _, content in self.turns[fold:])
+        return estimate_tokens(self.system_prompt + remaining) + self.summary_words * 2
+
+    def _fold(self, turns: list[tuple[str, str]]):
+        """Refresh the summary incrementally: old summary + new turns in, updated summary out."""
+        text = "\n\n".join(f"{name}: {content}" for name, content in turns)
+        response = ollama.chat(
+            model=self.model,
+            messages=[
+                {
+                    "role": "user",
+                    "content": SUMMARY_PROMPT.format(
+                        max_words=self.summary_words, summary=self.summary or "(none yet)", turns=text
+                    ),
+                }
+            ],
+            options={"num_predict": self.summary_words * 2},
+        )
+        self.summary = response["message"]["content"].strip()
+        self.folded += len(turns)
+
+    def stats(self) -> dict:
+        return {
+            "turns_kept": len(self.turns),
+            "turns_folded": self.folded,
+            "summary_tokens": estimate_tokens(self.summary),
+            "prompt_tokens": self.token_count(),
+        }
@@ -0,0 +1,84 @@
+import asyncio
+import json
+import os
+import time
+from ollama import AsyncClient
+from history import ConversationHistory
+
+"""
+Runs many independent debates concurrently and writes each transcript to its own JSONL file.
+No streaming to the terminal and no sleeps: every turn is one non-streamed request, so
+the only limits are the concurrency cap here and OLLAMA_NUM_PARALLEL on the server.
+"""
+
+
+async def run_debate(client: AsyncClient, debate: dict, out_dir: str, model: str = "llama3.1") -> str:
+    """Run one debate and append every turn to <out_dir>/<id>.jsonl as soon as it is generated."""
+    history = ConversationHistory(system_prompt=debate["topic"], model=model)
+    agents = debate["agents"]
+    path = os.path.join(out_dir, f"{debate['id']}.jsonl")
+
+    with open(path, "a") as transcript:
+        for i in range(debate.get("rounds", 5)):
+            speaker = agents[i % len(agents)]
+            response = await client.chat(model=model, messages=history.messages_for(speaker))
+            content = response["message"]["content"]
+            record = {
+                "debate_id": debate["id"],
+                "round": i + 1,
+                "speaker": speaker["name"],
+                "content": content,
+                "prompt_eval_count": response.get("prompt_eval_count"),
+                "eval_count": response.get("eval_count"),
+            }
+            transcript.write(json.dumps(record) + "\n")
+            transcript.flush()
+            # Folding old turns is a blocking summary call, keep it off the event loop
+            await asyncio.to_thread(history.add_turn, speaker["name"], content)
+    return path
+
+
+async def run_debates(
+    debates: list[dict], out_dir: str = "transcripts", concurrency: int = 4, model: str = "llama3.1"
+) -> dict:
+    """Run all debates, at most concurrency at a time; a failed debate is reported, not fatal."""
+    os.makedirs(out_dir, exist_ok=True)
+    client = AsyncClient()
+    semaphore = asyncio.Semaphore(concurrency)
+    results = {}
+
+    async def run_one(debate: dict):
+        async with semaphore:
+            start = time.perf_counter()
+            try:
+                path = await run_debate(client, debate, out_dir, model)
+                results[debate["id"]] = {"path": path, "seconds": time.perf_counter() - start}
+                print(f"✅ {debate['id']} done in {results[debate['id']]['seconds']:.1f}s -> {path}")
+            except Exception as e:
+                results[debate["id"]] = {"error": str(e)}
+                print(f"❌ {debate['id']} failed: {e}")
+
+    try:
+        await asyncio.gather(*(run_one(debate) for debate in debates))
+    finally:
+        await client.close()
+    return results
+
+
+if __name__ == "__main__":
+    philosopher = {"name": "Philosopher", "persona": "A philosopher who strongly argues for the existence of God."}
+    scientist = {"name": "Scientist", "persona": "A skeptical scientist who strongly argues against the existence of God."}
+    optimist = {"name": "Optimist", "persona": "A technologist convinced that AI will create more jobs than it destroys."}
+    economist = {"name": "Economist", "persona": "A labor economist worried that AI will destroy more jobs than it creates."}
+    tabs = {"name": "Tabs", "persona": "A developer who insists code must be indented with tabs."}
+    spaces = {"name": "Spaces", "persona": "A developer who insists code must be indented with spaces."}
+
+    debates = [
+        {"id": "god", "topic": "Two AI agents debate the existence of God.", "agents": [philosopher, scientist], "rounds": 6},
+        {"id": "ai-jobs", "topic": "Two AI agents debate whether AI will create or destroy jobs.", "agents": [optimist, economist], "rounds": 6},
+        {"id": "tabs-spaces", "topic": "Two AI agents debate tabs versus spaces.", "agents": [tabs, spaces], "rounds": 6},
+    ]
+
+    start = time.perf_counter()
+    results = asyncio.run(run_debates(debates, concurrency=3))
+    print(f"\n{len(results)} debates in {time.perf_counter() - start:.1f}s")
@@ -0,0 +1,86 @@
+import ollama
+
+"""
+KV-cache friendly debate sessions: every speaker keeps its own append-only message list,
+so each request starts with exactly the prompt of that speaker's previous request and
+Ollama only has to prefill the tokens added since then.
+Run the server with OLLAMA_NUM_PARALLEL >= number of speakers, so each speaker keeps its own cache slot.
+"""
+
+
+class SpeakerSession:
+    """One speaker's stable prompt: a single system message, then the opponent's turns as user
+    and this speaker's own turns as assistant, only ever appended to."""
+
+    def __init__(self, name: str, system_prompt: str, persona: str):
+        self.name = name
+        self.messages = [{"role": "system", "content": f"{system_prompt}\n\nYou are the {name}. {persona}"}]
+        self.context_tokens = 0  # tokens of the previous request plus its answer, i.e. what Ollama has cached
+        self.turns = []  # per-turn prefill stats
+
+
+class DebateSession:
+    """Runs turns between speakers, pinning the model in memory and logging prefill reuse per turn."""
+
+    def __init__(
+        self,
+        system_prompt: str,
+        speakers: list[dict],
+        model: str = "llama3.1",
+        keep_alive: str = "30m",
+        num_ctx: int = 8192,
+    ):
+        self.model = model
+        self.keep_alive = keep_alive  # keep the model (and its KV cache) loaded between turns
+        self.num_ctx = num_ctx  # must be the same on every request, a change reloads the model
+        self.sessions = {
+            speaker["name"]: SpeakerSession(speaker["name"], system_prompt, speaker["persona"]) for speaker in speakers
+        }
+
+    def turn(self, speaker: str, stream: bool = True):
+        """Generate speaker's next turn; yields text chunks, then records it in every session."""
+        session = self.sessions[speaker]
+        response = ollama.chat(
+            model=self.model,
+            messages=session.messages,
+            stream=stream,
+            keep_alive=self.keep_alive,
+            options={"num_ctx": self.num_ctx},
+        )
+        chunks = response if stream else [response]
+        content = ""
+        for chunk in chunks:
+            content += chunk["message"]["content"]
+            yield chunk["message"]["content"]
+            final = chunk
+        self._record(session, final)
+
+        session.messages.append({"role": "assistant", "content": content})
+        for other in self.sessions.values():
+            if other is not session:
+                other.messages.append({"role": "user", "content": f"{speaker}: {content}"})
+
+    def _record(self, session: SpeakerSession, final):
+        """Log how much of the prompt was prefilled versus reused from the cache."""
+        prompt_eval_count = final.get("prompt_eval_count") or 0
+        eval_count = final.get("eval_count") or 0
+        # Ollama counts only the prompt tokens it had to evaluate; if that is less than what the
+        # previous request left in the cache, the cached prefix was reused
+        cached = session.context_tokens if 0 < prompt_eval_count < session.context_tokens else 0
+        prompt_tokens = cached + prompt_eval_count
+        session.context_tokens = prompt_tokens + eval_count
+        stats = {
+            "prompt_tokens": prompt_tokens,
+            "prompt_eval_count": prompt_eval_count,
+            "cached_tokens": cached,
+            "prefill_ms": (final.get("prompt_eval_duration") or 0) / 1e6,
+        }
+        session.turns.append(stats)
+        print(
+            f"\n[{session.name}] prompt {prompt_tokens} tokens: {prompt_eval_count} prefilled, "
+            f"{cached} reused from cache, prefill {stats['prefill_ms']:.0f} ms"
+        )
+
+    def unload(self):
+        """Release the pinned model once the debate is over."""
+        ollama.generate(model=self.model, prompt="", keep_alive=0)
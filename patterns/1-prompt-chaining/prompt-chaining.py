@@ -1,9 +1,18 @@
 import logging
-from typing import Optional
-from datetime import datetime
+import os
+import statistics
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Literal, Optional
 from ollama import chat, ChatResponse
 from pydantic import BaseModel, Field
 
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))  # shared patterns/ helpers
+from prefilter import Prefilter
+from date_resolver import date_context, resolve_temporal_expressions, validate_event_datetime
+
 # Set up logging configuration
 logging.basicConfig(
     level=logging.DEBUG,
@@ -47,6 +56,22 @@ class EventConfirmation(BaseModel):
         description="Generated calendar link if applicable"
     )
 
+
+class FusedEventExtraction(BaseModel):
+    """Fused LLM call: gate fields and event details in one response"""
+
+    is_calendar_event: bool = Field(
+        description="Whether the input describes a calendar event"
+    )
+    confidence_score: float = Field(description="Confidence score between 0 and 1")
+    details: Optional[EventDetails] = Field(
+        default=None, description="Event details, only if the input is a calendar event"
+    )
+
+
+# Requests below this confidence are rejected by the gate
+CONFIDENCE_THRESHOLD = 0.7
+
 # --------------------------------------------------------------
 # Step 2: Define the functions (tools)
 # --------------------------------------------------------------
@@ -55,8 +80,8 @@ def extract_event_info(user_input: str) -> EventExtraction:
     logger.info("Starting event extraction analysis")
     logger.debug(f"Input text: {user_input}")
 
-    today = datetime.now()
-    datetime_context = f"Today is {today.strftime('%A, %B %d, %Y %H:%M:%S')}."
+    # Day granularity only: the system prompt stays identical all day, so its prefix can be cached
+    datetime_context = date_context()
 
     response: ChatResponse = chat(
         model="llama3.1",
@@ -80,21 +105,23 @@ def parse_event_details(description: str) -> EventDetails:
     logger.info("Starting event details parsing")
     logger.debug(f"Event description: {description}")
 
-    today = datetime.now()
-    datetime_context = f"Today is {today.strftime('%A, %B %d, %Y %H:%M:%S')}."
+    # Relative dates and times are resolved locally, the LLM only copies the ISO 8601 values
+    resolution = resolve_temporal_expressions(description)
+    datetime_context = date_context()
 
     response: ChatResponse = chat(
         model="llama3.1",
         messages=[
             {
                 "role": "system",
-                "content": f"{datetime_context} Extract detailed event information from user input. When dates reference 'next Tuesday' or similar relative dates, use this current date as reference. Include the time of the event.",
+                "content": f"{datetime_context} Extract detailed event information from user input. Dates and times in the input are already resolved to ISO 8601, copy them as they are. When dates reference 'next Tuesday' or similar relative dates, use this current date as reference. Include the time of the event.",
             },
-            {"role": "user", "content": description},
+            {"role": "user", "content": resolution.normalized_text},
         ],
         format=EventDetails.model_json_schema(),
     )
     result = EventDetails.model_validate_json(response.message.content)
+    result.datetime = validate_event_datetime(result.datetime, resolution)
     logger.info(
         f"Parsed event details - Name: {result.name}, Date: {result.datetime}, Duration: {result.duration_minutes}min"
     )
@@ -121,25 +148,125 @@ def generate_confirmation(event_details: EventDetails) -> EventConfirmation:
     logger.info("Confirmation message generated successfully")
     return result
 
+def extract_and_parse_event(user_input: str) -> FusedEventExtraction:
+    """Fused LLM call: gate check and detail parsing in one round trip"""
+    logger.info("Starting fused event extraction and parsing")
+    logger.debug(f"Input text: {user_input}")
+
+    # Relative dates and times are resolved locally, the LLM only copies the ISO 8601 values
+    resolution = resolve_temporal_expressions(user_input)
+    datetime_context = date_context()
+
+    response: ChatResponse = chat(
+        model="llama3.1",
+        messages=[
+            {
+                "role": "system",
+                "content": f"{datetime_context} Analyze if the text describes a calendar event. If it does, also extract detailed event information, otherwise leave the details empty. Dates and times in the input are already resolved to ISO 8601, copy them as they are. When dates reference 'next Tuesday' or similar relative dates, use this current date as reference. Include the time of the event.",
+            },
+            {"role": "user", "content": resolution.normalized_text},
+        ],
+        format=FusedEventExtraction.model_json_schema(),
+    )
+    result = FusedEventExtraction.model_validate_json(response.message.content)
+    if result.details is not None:
+        result.details.datetime = validate_event_datetime(result.details.datetime, resolution)
+    logger.info(
+        f"Fused extraction complete - Is calendar event: {result.is_calendar_event}, Confidence: {result.confidence_score:.2f}"
+    )
+    return result
+
+class SpeculationStats:
+    """Counts how often the speculative detail parse was used or thrown away"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.launched = 0
+        self.hits = 0  # gate passed, speculative result committed
+        self.wasted = 0  # gate failed, the parse ran (or was running) for nothing
+        self.cancelled = 0  # gate failed before the parse started
+
+    def record(self, outcome: str):
+        with self.lock:
+            self.launched += 1
+            setattr(self, outcome, getattr(self, outcome) + 1)
+
+    def stats(self) -> dict:
+        with self.lock:
+            return {
+                "launched": self.launched,
+                "hit_rate": self.hits / self.launched if self.launched else 0.0,
+                "waste_rate": self.wasted / self.launched if self.launched else 0.0,
+                "cancelled": self.cancelled,
+            }
+
+
+speculation_stats = SpeculationStats()
+speculation_executor = ThreadPoolExecutor(max_workers=4)
+
+# Settles obvious inputs locally, only the ambiguous ones pay for the LLM gate
+prefilter = Prefilter(reject_below=0.05, accept_above=0.95)
+
 # --------------------------------------------------------------
 # Step 3: Chain the functions together
 # --------------------------------------------------------------
-def process_calendar_request(user_input: str) -> Optional[EventConfirmation]:
-    """Main function implementing prompt chaining with gate checks"""
-
-    # First LLM call: Determine if user input a valid calendar event
-    initial_extraction = extract_event_info(user_input)
-    if (
-        not initial_extraction.is_calendar_event 
-        or initial_extraction.confidence_score < 0.7
-    ): # Gate check
+def passes_gate(is_calendar_event: bool, confidence_score: float) -> bool:
+    """Gate check shared by both chain variants"""
+    if not is_calendar_event or confidence_score < CONFIDENCE_THRESHOLD:
         logger.warning(
-            f"Gate check failed - is_calendar_event: {initial_extraction.is_calendar_event}, confidence: {initial_extraction.confidence_score:.2f}"
+            f"Gate check failed - is_calendar_event: {is_calendar_event}, confidence: {confidence_score:.2f}"
         )
+        return False
+    return True
+
+
+def process_calendar_request(
+    user_input: str,
+    mode: Literal["chained", "fused", "speculative"] = "chained",
+    prefilter: Optional[Prefilter] = prefilter,
+) -> Optional[EventConfirmation]:
+    """Main function implementing prompt chaining with gate checks
+
+    "chained" runs extraction and detail parsing as two LLM calls, "fused" does both in one,
+    "speculative" starts the detail parse on the raw input while the gate call is still running.
+    With a prefilter, clear negatives and clear positives skip the LLM gate entirely.
+    """
+
+    decision = prefilter.classify(user_input) if prefilter else None
+    if decision and decision.action == "reject":
+        logger.warning(f"Pre-filter rejected input (score {decision.score:.3f})")
         return None
 
-    # Second LLM call: Extract event details
-    event_details = parse_event_details(initial_extraction.description)
+    if decision and decision.action == "accept":
+        logger.info(f"Pre-filter accepted input (score {decision.score:.3f}), skipping the gate")
+        event_details = parse_event_details(user_input)
+    elif mode == "speculative":
+        # The extraction's description is the user input echoed back, so the parse can start right away
+        speculative_parse = speculation_executor.submit(parse_event_details, user_input)
+        initial_extraction = extract_event_info(user_input)
+        if not passes_gate(initial_extraction.is_calendar_event, initial_extraction.confidence_score):
+            # A parse already in flight cannot be stopped, its result is simply discarded
+            speculation_stats.record("cancelled" if speculative_parse.cancel() else "wasted")
+            return None
+        speculation_stats.record("hits")
+        event_details = speculative_parse.result()
+    elif mode == "fused":
+        # First LLM call: gate fields and event details together
+        extraction = extract_and_parse_event(user_input)
+        if not passes_gate(extraction.is_calendar_event, extraction.confidence_score):
+            return None
+        if extraction.details is None:
+            logger.warning("Gate passed but no event details were returned")
+            return None
+        event_details = extraction.details
+    else:
+        # First LLM call: Determine if user input a valid calendar event
+        initial_extraction = extract_event_info(user_input)
+        if not passes_gate(initial_extraction.is_calendar_event, initial_extraction.confidence_score):
+            return None
+
+        # Second LLM call: Extract event details
+        event_details = parse_event_details(initial_extraction.description)
 
     # Third LLM call: Generate confirmation
     confirmation = generate_confirmation(event_details)
@@ -169,4 +296,52 @@ if result:
     if result.calendar_link:
         print(f"Calendar Link: {result.calendar_link}")
 else:
-    print("This doesn't appear to be a calendar event request.")
\ No newline at end of file
+    print("This doesn't appear to be a calendar event request.")
+
+# --------------------------------------------------------------
+# Step 6: Benchmark the chained and fused variants side by side
+# --------------------------------------------------------------
+def benchmark_chains(inputs: list[str], modes=("chained", "fused"), repeats: int = 1) -> dict:
+    """Run every input through each mode and compare latency and gate decisions"""
+    report = {}
+    for mode in modes:
+        latencies, accepted = [], []
+        for _ in range(repeats):
+            for text in inputs:
+                start = time.perf_counter()
+                # No pre-filter here, so every input exercises the LLM gate of the mode being measured
+                accepted.append(process_calendar_request(text, mode=mode, prefilter=None) is not None)
+                latencies.append(time.perf_counter() - start)
+        report[mode] = {
+            "mean_s": statistics.mean(latencies),
+            "p50_s": statistics.median(latencies),
+            "max_s": max(latencies),
+            "accepted": sum(accepted),
+            "decisions": accepted,
+        }
+    for mode, stats in report.items():
+        print(
+            f"{mode:>11}: mean {stats['mean_s']:.2f}s, p50 {stats['p50_s']:.2f}s, max {stats['max_s']:.2f}s, "
+            f"accepted {stats['accepted']}/{len(stats['decisions'])}"
+        )
+    baseline = report[modes[0]]["decisions"]
+    for mode in modes[1:]:
+        agreement = sum(a == b for a, b in zip(baseline, report[mode]["decisions"])) / len(baseline)
+        print(f"Gate agreement between {modes[0]} and {mode}: {agreement:.0%}")
+    if "speculative" in modes:
+        print(f"Speculation: {speculation_stats.stats()}")
+    return report
+
+
+# Opt-in: the comparison makes up to 27 extra LLM calls
+BENCHMARK = False
+
+if BENCHMARK:
+    benchmark_chains(
+        [
+            "Let's schedule a 1h team meeting next Tuesday at 2pm with Alice and Bob to discuss the project roadmap.",
+            "Book a 30 minute call with Carol tomorrow at 9am about the budget.",
+            "Can you send an email to Alice and Bob to discuss the project roadmap?",
+        ],
+        modes=("chained", "fused", "speculative"),
+    )
@@ -2,6 +2,11 @@ from typing import Optional, Literal
 from pydantic import BaseModel, Field
 from ollama import chat, ChatResponse
 import logging
+import os
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))  # shared patterns/ helpers
+from prefilter import Prefilter
 
 # Set up logging configuration
 logging.basicConfig(
@@ -139,12 +144,30 @@ def handle_modify_event(description: str) -> CalendarResponse:
     )
 
 
-def process_calendar_request(user_input: str) -> Optional[CalendarResponse]:
+# Settles obvious inputs locally, only the ambiguous ones pay for the router LLM call
+prefilter = Prefilter(reject_below=0.05, accept_above=0.95)
+
+
+def process_calendar_request(
+    user_input: str, prefilter: Optional[Prefilter] = prefilter
+) -> Optional[CalendarResponse]:
     """Main function implementing the routing workflow"""
     logger.info("Processing calendar request")
 
-    # Route the request
-    route_result = route_calendar_request(user_input)
+    # Clear negatives are rejected, and clear positives with a clear leading verb are routed,
+    # without the router LLM call
+    decision = prefilter.classify(user_input) if prefilter else None
+    if decision and decision.action == "reject":
+        logger.warning(f"Pre-filter rejected request (score {decision.score:.3f})")
+        return None
+    if decision and decision.action == "accept" and decision.request_type is not None:
+        logger.info(f"Pre-filter routed request as: {decision.request_type} (score {decision.score:.3f})")
+        route_result = CalendarRequestType(
+            request_type=decision.request_type, confidence_score=decision.score, description=user_input
+        )
+    else:
+        # Route the request
+        route_result = route_calendar_request(user_input)
 
     # Check confidence threshold
     if route_result.confidence_score < 0.7:
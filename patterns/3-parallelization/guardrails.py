@@ -0,0 +1,65 @@
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Optional
+from pydantic import BaseModel, Field
+
+logger = logging.getLogger(__name__)
+
+# --------------------------------------------------------------
+# Guardrail runner that stops at the first decisive rejection
+# --------------------------------------------------------------
+
+
+class Guard:
+    """A named async check plus the rule that decides whether its result passes"""
+
+    def __init__(
+        self,
+        name: str,
+        check: Callable[[str], Awaitable[BaseModel]],
+        passes: Callable[[Any], bool],
+    ):
+        self.name = name
+        self.check = check
+        self.passes = passes
+
+
+class GuardrailOutcome(BaseModel):
+    """Result of running all guards against one input"""
+
+    is_valid: bool = Field(description="Whether every guard passed")
+    results: dict[str, Any] = Field(description="Result of each guard that finished, by guard name")
+    failed_guard: Optional[str] = Field(default=None, description="Guard that rejected the input")
+    cancelled: list[str] = Field(default_factory=list, description="Guards cancelled after the rejection")
+
+
+async def run_guardrails(user_input: str, guards: list[Guard]) -> GuardrailOutcome:
+    """Run guards in parallel; cancel the rest as soon as one rejects the input"""
+    tasks = {asyncio.create_task(guard.check(user_input)): guard for guard in guards}
+    pending = set(tasks)
+    results = {}
+    try:
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                guard = tasks[task]
+                try:
+                    result = task.result()
+                except Exception as e:
+                    # A guard that cannot give an answer rejects the input (fail closed)
+                    logger.error(f"Guard {guard.name} failed: {e}")
+                    result = None
+                results[guard.name] = result
+                if result is None or not guard.passes(result):
+                    cancelled = [tasks[t].name for t in pending]
+                    if cancelled:
+                        logger.info(f"Guard {guard.name} rejected input, cancelling: {cancelled}")
+                    return GuardrailOutcome(
+                        is_valid=False, results=results, failed_guard=guard.name, cancelled=cancelled
+                    )
+        return GuardrailOutcome(is_valid=True, results=results)
+    finally:
+        # Cancelling drops the in-flight HTTP requests, so Ollama stops generating results nobody reads
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
@@ -0,0 +1,85 @@
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable
+
+logger = logging.getLogger(__name__)
+
+# --------------------------------------------------------------
+# Micro-batching: many pending inputs answered by one LLM call
+# --------------------------------------------------------------
+
+
+class MicroBatcher:
+    """Gathers inputs for a few milliseconds (or up to max_items) and checks them with one batched call.
+
+    batch_call receives the list of inputs and must return one result per input, in order.
+    If it fails or returns the wrong number of results, every input falls back to single_call.
+    """
+
+    def __init__(
+        self,
+        batch_call: Callable[[list[str]], Awaitable[list[Any]]],
+        single_call: Callable[[str], Awaitable[Any]],
+        max_wait: float = 0.005,
+        max_items: int = 16,
+    ):
+        self.batch_call = batch_call
+        self.single_call = single_call
+        self.max_wait = max_wait
+        self.max_items = max_items
+        self.pending: list[tuple[str, asyncio.Future]] = []
+        self.timer = None
+        self.running = set()
+        self.batches = 0
+        self.items = 0
+        self.fallbacks = 0
+
+    async def submit(self, user_input: str) -> Any:
+        """Queue one input and wait for its own result from the next batch"""
+        future = asyncio.get_running_loop().create_future()
+        self.pending.append((user_input, future))
+        if len(self.pending) >= self.max_items:
+            self._flush()
+        elif self.timer is None:
+            self.timer = asyncio.get_running_loop().call_later(self.max_wait, self._flush)
+        return await future
+
+    def _flush(self):
+        if self.timer is not None:
+            self.timer.cancel()
+            self.timer = None
+        batch, self.pending = self.pending, []
+        if batch:
+            task = asyncio.create_task(self._run(batch))
+            self.running.add(task)
+            task.add_done_callback(self.running.discard)
+
+    async def _run(self, batch: list[tuple[str, asyncio.Future]]):
+        inputs = [user_input for user_input, _ in batch]
+        self.batches += 1
+        self.items += len(inputs)
+        try:
+            results = await self.batch_call(inputs)
+            if len(results) != len(inputs):
+                raise ValueError(f"Expected {len(inputs)} results, got {len(results)}")
+        except Exception as e:
+            logger.warning(f"Batched call failed ({e}), falling back to {len(inputs)} single calls")
+            self.fallbacks += 1
+            results = await asyncio.gather(
+                *(self.single_call(user_input) for user_input in inputs), return_exceptions=True
+            )
+        for (_, future), result in zip(batch, results):
+            if future.done():  # the caller was cancelled while the batch was running
+                continue
+            if isinstance(result, Exception):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
+
+    def stats(self) -> dict:
+        return {
+            "batches": self.batches,
+            "items": self.items,
+            "items_per_batch": self.items / self.batches if self.batches else 0.0,
+            "fallbacks": self.fallbacks,
+        }
@@ -0,0 +1,67 @@
+import logging
+from typing import Optional
+import httpx
+from ollama import AsyncClient
+
+logger = logging.getLogger(__name__)
+
+# --------------------------------------------------------------
+# Shared, lifecycle-managed AsyncClient for the guard checks
+# --------------------------------------------------------------
+
+
+class OllamaClientPool:
+    """One AsyncClient (and so one HTTP connection pool) shared by every guard check"""
+
+    def __init__(
+        self,
+        host: Optional[str] = None,
+        max_connections: int = 10,
+        max_keepalive_connections: int = 10,
+        keepalive_expiry: float = 30.0,
+    ):
+        self.host = host
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry,
+        )
+        self._client: Optional[AsyncClient] = None
+
+    @property
+    def client(self) -> AsyncClient:
+        """The shared client, created on first use inside the running event loop"""
+        if self._client is None:
+            self._client = AsyncClient(host=self.host, limits=self.limits)
+            logger.debug(f"Opened shared Ollama client (limits: {self.limits})")
+        return self._client
+
+    async def aclose(self):
+        """Close every pooled connection; the next use opens a fresh client"""
+        if self._client is not None:
+            logger.debug(f"Closing shared Ollama client: {self.stats()}")
+            await self._client.close()
+            self._client = None
+
+    async def __aenter__(self) -> "OllamaClientPool":
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.aclose()
+
+    def stats(self) -> dict:
+        """Open, idle and in-use connections of the underlying httpx pool"""
+        connections = []
+        if self._client is not None:
+            # Relies on private internals (ollama.AsyncClient -> httpx.AsyncClient -> AsyncHTTPTransport ->
+            # httpcore pool), there is no public API for pool usage; falls back to no connections if they change
+            pool = getattr(getattr(self._client._client, "_transport", None), "_pool", None)
+            connections = list(getattr(pool, "connections", []))
+        open_connections = [c for c in connections if not c.is_closed()]
+        idle = sum(1 for c in open_connections if c.is_idle())
+        return {
+            "open": len(open_connections),
+            "idle": idle,
+            "in_use": len(open_connections) - idle,
+            "max_connections": self.limits.max_connections,
+        }
@@ -0,0 +1,94 @@
+import os
+import sqlite3
+import threading
+from abc import ABC, abstractmethod
+from typing import Optional
+
+# --------------------------------------------------------------
+# Checkpoint stores for resuming orchestrator runs
+# --------------------------------------------------------------
+
+
+class CheckpointStore(ABC):
+    """Stores the JSON result of each completed step of a job, keyed by job id and step name"""
+
+    @abstractmethod
+    def load(self, job_id: str, step: str) -> Optional[str]:
+        """JSON saved for the step, or None if the step has not completed"""
+
+    @abstractmethod
+    def save(self, job_id: str, step: str, data: str):
+        """Store the JSON result of a completed step, replacing any earlier one"""
+
+    @abstractmethod
+    def clear(self, job_id: str):
+        """Remove every checkpoint of the job"""
+
+
+class DirectoryCheckpointStore(CheckpointStore):
+    """One JSON file per step under <root>/<job_id>/"""
+
+    def __init__(self, root: str = "checkpoints"):
+        self.root = root
+
+    def _path(self, job_id: str, step: str) -> str:
+        return os.path.join(self.root, job_id, f"{step}.json")
+
+    def load(self, job_id: str, step: str) -> Optional[str]:
+        try:
+            with open(self._path(job_id, step), "r") as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+
+    def save(self, job_id: str, step: str, data: str):
+        path = self._path(job_id, step)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Write then rename, so a crash mid-write never leaves a truncated checkpoint
+        with open(f"{path}.tmp", "w") as f:
+            f.write(data)
+        os.replace(f"{path}.tmp", path)
+
+    def clear(self, job_id: str):
+        directory = os.path.join(self.root, job_id)
+        if os.path.isdir(directory):
+            for name in os.listdir(directory):
+                os.remove(os.path.join(directory, name))
+            os.rmdir(directory)
+
+
+class SQLiteCheckpointStore(CheckpointStore):
+    """All checkpoints in one SQLite table, safe to share between worker threads"""
+
+    def __init__(self, path: str = "checkpoints.db"):
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.lock = threading.Lock()
+        with self.lock, self.conn:
+            self.conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS checkpoints (
+                    job_id TEXT NOT NULL,
+                    step TEXT NOT NULL,
+                    data TEXT NOT NULL,
+                    PRIMARY KEY (job_id, step)
+                )
+                """
+            )
+
+    def load(self, job_id: str, step: str) -> Optional[str]:
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT data FROM checkpoints WHERE job_id = ? AND step = ?", (job_id, step)
+            ).fetchone()
+        return row[0] if row else None
+
+    def save(self, job_id: str, step: str, data: str):
+        with self.lock, self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO checkpoints (job_id, step, data) VALUES (?, ?, ?)",
+                (job_id, step, data),
+            )
+
+    def clear(self, job_id: str):
+        with self.lock, self.conn:
+            self.conn.execute("DELETE FROM checkpoints WHERE job_id = ?", (job_id,))
@@ -0,0 +1,102 @@
+import logging
+import threading
+import uuid
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from typing import Dict, Optional
+
+from orchestrator import BlogOrchestrator, JobProgress
+
+logger = logging.getLogger(__name__)
+
+# --------------------------------------------------------------
+# Runs many blog writing jobs on one shared orchestrator
+# --------------------------------------------------------------
+
+
+class BlogJobRunner:
+    """Accepts many write_blog requests and runs up to max_jobs of them at once.
+
+    Every job shares the orchestrator, so plan, section and review calls of all jobs
+    together stay under its max_concurrent_calls cap.
+    """
+
+    def __init__(self, orchestrator: BlogOrchestrator, max_jobs: int = 4):
+        self.orchestrator = orchestrator
+        self.executor = ThreadPoolExecutor(max_workers=max_jobs, thread_name_prefix="blog-job")
+        self.jobs: Dict[str, JobProgress] = {}
+        self.futures: Dict[str, Future] = {}
+        self.lock = threading.Lock()
+
+    def submit(self, topic: str, target_length: int, style: str, job_id: Optional[str] = None) -> str:
+        """Queue a blog writing job and return its id"""
+        job_id = job_id or uuid.uuid4().hex
+        with self.lock:
+            if job_id in self.futures and not self.futures[job_id].done():
+                raise ValueError(f"Job {job_id} is already running")
+            progress = JobProgress(job_id=job_id, topic=topic)
+            self.jobs[job_id] = progress
+            self.futures[job_id] = self.executor.submit(
+                self._run, topic, target_length, style, job_id, progress
+            )
+        logger.info(f"Queued job {job_id}: {topic}")
+        return job_id
+
+    def _run(self, topic: str, target_length: int, style: str, job_id: str, progress: JobProgress) -> Dict:
+        try:
+            return self.orchestrator.write_blog(
+                topic=topic, target_length=target_length, style=style, job_id=job_id, progress=progress
+            )
+        except Exception as e:
+            logger.error(f"Job {job_id} failed: {e}")
+            progress.status = "failed"
+            progress.error = str(e)
+            raise
+
+    def progress(self) -> Dict[str, JobProgress]:
+        """Snapshot of every job's progress, by job id"""
+        with self.lock:
+            return {job_id: progress.model_copy() for job_id, progress in self.jobs.items()}
+
+    def result(self, job_id: str, timeout: Optional[float] = None) -> Dict:
+        """Wait for one job and return its write_blog result, re-raising its error if it failed"""
+        return self.futures[job_id].result(timeout=timeout)
+
+    def wait_all(self, timeout: Optional[float] = None) -> Dict[str, JobProgress]:
+        """Wait for every submitted job to finish and return their final progress"""
+        with self.lock:
+            futures = list(self.futures.values())
+        wait(futures, timeout=timeout)
+        return self.progress()
+
+    def shutdown(self, wait: bool = True):
+        self.executor.shutdown(wait=wait)
+
+    def __enter__(self) -> "BlogJobRunner":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.shutdown()
+
+
+if __name__ == "__main__":
+    import time
+
+    logging.basicConfig(level=logging.INFO)
+    orchestrator = BlogOrchestrator(review_mode="edits", max_concurrent_calls=8)
+
+    with BlogJobRunner(orchestrator, max_jobs=3) as runner:
+        job_ids = [
+            runner.submit("The impact of AI on software engineering", 1200, "technical but accessible"),
+            runner.submit("How to run local LLMs with Ollama", 800, "conversational"),
+            runner.submit("Writing maintainable Python", 1000, "practical"),
+        ]
+        while not all(runner.futures[job_id].done() for job_id in job_ids):
+            for progress in runner.progress().values():
+                print(f"{progress.job_id[:8]} {progress.status:<9} {progress.sections_done}/{progress.sections_total}")
+            time.sleep(2)
+
+        for job_id, progress in runner.wait_all().items():
+            if progress.status == "done":
+                print(f"\n{progress.topic}:\n{runner.result(job_id)['review'].final_version}")
+            else:
+                print(f"\n{progress.topic} failed: {progress.error}")
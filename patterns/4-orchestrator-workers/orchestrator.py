@@ -1,6 +1,12 @@
-from typing import List, Dict
+import asyncio
+import json
+import re
+import threading
+from typing import AsyncIterator, Callable, List, Dict, Literal, Optional, Union
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
 from pydantic import BaseModel, Field
-from ollama import chat, ChatResponse
+from ollama import chat, AsyncClient, ChatResponse
+from checkpoints import CheckpointStore, DirectoryCheckpointStore
 import logging
 
 # Set up logging configuration
@@ -21,6 +27,10 @@ class SubTask(BaseModel):
     description: str = Field(description="What this section should cover")
     style_guide: str = Field(description="Writing style for this section")
     target_length: int = Field(description="Target word count for this section")
+    depends_on: List[int] = Field(
+        default_factory=list,
+        description="Indexes (0-based) of earlier sections this section must build on, empty if independent",
+    )
 
 
 class OrchestratorPlan(BaseModel):
@@ -54,6 +64,78 @@ class ReviewFeedback(BaseModel):
     )
     final_version: str = Field(description="Complete, polished blog post")
 
+
+class SectionEdit(BaseModel):
+    """Targeted edit to one section, applied locally instead of regenerating the post"""
+    section_name: str = Field(description="Name of the section to edit")
+    anchor: str = Field(description="Exact text copied from the section that should be replaced")
+    replacement: str = Field(description="New text that replaces the anchor")
+    reason: str = Field(description="Why this edit improves the post")
+
+
+class EditReview(BaseModel):
+    """Review that returns only targeted edits"""
+    cohesion_score: float = Field(description="How well sections flow together (0-1)")
+    edits: List[SectionEdit] = Field(description="Targeted edits, empty if none are needed")
+
+
+class ChunkReview(BaseModel):
+    """Review of one section or a pair of adjacent sections"""
+    transition_score: float = Field(description="How well these sections flow into each other (0-1)")
+    findings: List[str] = Field(description="Short descriptions of cohesion issues, at most 3")
+    edits: List[SectionEdit] = Field(description="Targeted edits, empty if none are needed")
+
+
+class ReviewSummary(BaseModel):
+    """Merged findings of several reviews"""
+    cohesion_score: float = Field(description="How well the reviewed part of the post flows together (0-1)")
+    findings: List[str] = Field(description="The most important cohesion issues, at most 5")
+
+
+class PlanReady(BaseModel):
+    """Streamed event: the blog structure is planned"""
+    type: Literal["plan_ready"] = "plan_ready"
+    plan: OrchestratorPlan
+
+
+class SectionToken(BaseModel):
+    """Streamed event: the next piece of a section's text as the model generates it.
+
+    token is plain, already unescaped text of SectionContent.content; concatenating the tokens
+    of a section gives its content. key_points arrive with SectionCompleted only.
+    """
+    type: Literal["section_token"] = "section_token"
+    index: int
+    section_type: str
+    token: str
+
+
+class SectionCompleted(BaseModel):
+    """Streamed event: a section is fully written"""
+    type: Literal["section_completed"] = "section_completed"
+    index: int
+    section_type: str
+    content: SectionContent
+
+
+class ReviewCompleted(BaseModel):
+    """Streamed event: the review is done, this is the last event"""
+    type: Literal["review_completed"] = "review_completed"
+    review: ReviewFeedback
+
+
+BlogEvent = Union[PlanReady, SectionToken, SectionCompleted, ReviewCompleted]
+
+
+class JobProgress(BaseModel):
+    """Progress of one blog writing job"""
+    job_id: str
+    topic: str
+    status: Literal["queued", "planning", "writing", "reviewing", "done", "failed"] = "queued"
+    sections_total: int = 0
+    sections_done: int = 0
+    error: Optional[str] = None
+
 # --------------------------------------------------------------
 # Step 2: Define prompts
 # --------------------------------------------------------------
@@ -79,6 +161,7 @@ Define the target audience and their interests/needs.
 - Type: section_type
 - Description: what this section should cover
 - Style: writing style guidelines
+- Depends on: indexes of sections whose content this section needs (usually none)
 
 [Additional sections as needed...]
 """
@@ -90,6 +173,9 @@ Section Type: {section_type}
 Section Goal: {description}
 Style Guide: {style_guide}
 
+Related sections (build on them, do not repeat them):
+{previous_sections}
+
 Return your response in this format:
 
 # Content
@@ -117,17 +203,186 @@ For suggested edits, focus on improving transitions and maintaining consistent t
 The final version should incorporate your suggested improvements into a polished, cohesive blog post.
 """
 
+EDIT_REVIEWER_PROMPT = """
+Review this blog post for cohesion and flow:
+
+Topic: {topic}
+Target Audience: {audience}
+
+Sections:
+{sections}
+
+Provide a cohesion score between 0.0 and 1.0 and a list of targeted edits. Do not rewrite the post.
+
+The cohesion score should reflect how well the sections flow together, with 1.0 being perfect cohesion.
+Each edit names the section, copies the exact text to replace as the anchor (a sentence or phrase, verbatim),
+and gives the replacement text. Focus on improving transitions and maintaining consistent tone across sections.
+"""
+
+CHUNK_REVIEWER_PROMPT = """
+Review this part of a blog post for cohesion and flow:
+
+Topic: {topic}
+Target Audience: {audience}
+
+Sections:
+{sections}
+
+Provide a transition score between 0.0 and 1.0 for how well these sections flow into each other,
+at most 3 short findings about cohesion issues, and targeted edits. Do not rewrite the sections.
+Each edit names the section, copies the exact text to replace as the anchor (a sentence or phrase, verbatim),
+and gives the replacement text. Focus on transitions and consistent tone.
+"""
+
+REDUCE_REVIEWER_PROMPT = """
+Combine these reviews of consecutive parts of a blog post into one review:
+
+Topic: {topic}
+Target Audience: {audience}
+
+Reviews:
+{reviews}
+
+Provide an overall cohesion score between 0.0 and 1.0, with 1.0 being perfect cohesion,
+and the most important findings (at most 5).
+"""
+
 # --------------------------------------------------------------
 # Step 3: Implement orchestrator
 # --------------------------------------------------------------
 
+def apply_edits(
+    sections: Dict[str, SectionContent], edits: List[SectionEdit]
+) -> Dict[str, str]:
+    """Apply targeted edits to the section texts, skipping edits whose anchor is not found"""
+    texts = {section_type: content.content for section_type, content in sections.items()}
+    by_name = {section_type.strip().lower(): section_type for section_type in texts}
+    for edit in edits:
+        section_type = by_name.get(edit.section_name.strip().lower())
+        if section_type is None:
+            logger.warning(f"Skipping edit for unknown section: {edit.section_name}")
+        elif not edit.anchor or edit.anchor not in texts[section_type]:
+            logger.warning(f"Skipping edit, anchor not found in {section_type}: {edit.anchor[:60]!r}")
+        else:
+            texts[section_type] = texts[section_type].replace(edit.anchor, edit.replacement, 1)
+    return texts
+
+
+class JsonStringFieldStream:
+    """Pulls the text of one string field out of a JSON object while it is still being streamed.
+
+    feed() takes raw JSON chunks and returns the newly decoded part of the field's value, so the
+    structured output can be shown as plain text before the object is complete.
+    """
+
+    def __init__(self, field: str):
+        self.start_pattern = re.compile(r'"' + re.escape(field) + r'"\s*:\s*"')
+        self.raw = ""
+        self.position = None  # index in raw of the next undecoded character of the value
+        self.done = False
+
+    def feed(self, chunk: str) -> str:
+        self.raw += chunk
+        if self.done:
+            return ""
+        if self.position is None:
+            match = self.start_pattern.search(self.raw)
+            if match is None:
+                return ""
+            self.position = match.end()
+        text = []
+        while self.position < len(self.raw):
+            char = self.raw[self.position]
+            if char == '"':
+                self.done = True
+                break
+            if char != "\\":
+                text.append(char)
+                self.position += 1
+                continue
+            # Escape sequence: wait until it is complete (a surrogate pair needs two \uXXXX)
+            length = 6 if self.raw[self.position + 1 : self.position + 2] == "u" else 2
+            if length == 6 and self.raw[self.position + 2 : self.position + 4].lower() in ("d8", "d9", "da", "db"):
+                length = 12
+            escape = self.raw[self.position : self.position + length]
+            if len(escape) < length:
+                break
+            text.append(json.loads(f'"{escape}"'))
+            self.position += length
+        return "".join(text)
+
+
+def section_labels(sections: List[SubTask]) -> List[str]:
+    """Unique name for each section, numbering repeated section types ("Example", "Example (2)")"""
+    seen: Dict[str, int] = {}
+    labels = []
+    for section in sections:
+        seen[section.section_type] = seen.get(section.section_type, 0) + 1
+        count = seen[section.section_type]
+        labels.append(section.section_type if count == 1 else f"{section.section_type} ({count})")
+    return labels
+
+
+def resolve_dependencies(sections: List[SubTask]) -> List[set]:
+    """Valid dependency indexes of each section; edges that would form a cycle are dropped"""
+    dependencies = [
+        {d for d in section.depends_on if 0 <= d < len(sections) and d != index}
+        for index, section in enumerate(sections)
+    ]
+    resolved = set()
+    while len(resolved) < len(sections):
+        ready = [
+            i for i in range(len(sections)) if i not in resolved and dependencies[i] <= resolved
+        ]
+        if not ready:
+            # The remaining sections wait on each other in a cycle, break it at the first of them
+            i = min(set(range(len(sections))) - resolved)
+            logger.warning(f"Section {i} is part of a dependency cycle, ignoring {sorted(dependencies[i] - resolved)}")
+            dependencies[i] &= resolved
+            ready = [i]
+        resolved.update(ready)
+    return dependencies
+
+
 class BlogOrchestrator:
-    def __init__(self):
-        self.sections_content = {}
+    def __init__(
+        self,
+        max_workers: int = 4,
+        review_mode: str = "full",
+        reduce_fanout: int = 8,
+        checkpoint_store: Optional[CheckpointStore] = None,
+        max_concurrent_calls: int = 8,
+    ):
+        # No per-job state is kept on the instance, so one orchestrator can run many blogs at once
+        # Sections are written concurrently; set OLLAMA_NUM_PARALLEL on the server to serve them in parallel
+        self.max_workers = max_workers
+        # "full": the reviewer rewrites the whole post; "edits": it returns targeted edits applied locally;
+        # "map_reduce": adjacent section pairs are reviewed in parallel and their findings merged, so
+        # no single prompt has to hold the whole post
+        self.review_mode = review_mode
+        self.reduce_fanout = reduce_fanout  # chunk reviews merged per reduce call
+        # Plan, sections and review are saved as they complete, so a rerun with the same job id resumes
+        self.checkpoint_store = checkpoint_store
+        # Global cap on LLM calls in flight, shared by every job running on this orchestrator
+        self.llm_slots = threading.BoundedSemaphore(max_concurrent_calls)
+
+    def call_llm(self, **kwargs) -> ChatResponse:
+        """chat() gated by the orchestrator-wide concurrency cap"""
+        with self.llm_slots:
+            return chat(**kwargs)
+
+    async def acquire_llm_slot(self, poll_interval: float = 0.01):
+        """Take a slot of the cap from async code without blocking the event loop.
+
+        Polls instead of waiting in a thread, so a cancelled caller never leaves behind
+        a thread that acquires a slot nobody releases.
+        """
+        while not self.llm_slots.acquire(blocking=False):
+            await asyncio.sleep(poll_interval)
 
     def get_plan(self, topic: str, target_length: int, style: str) -> OrchestratorPlan:
         """Get orchestrator's blog structure plan"""
-        response: ChatResponse = chat(
+        response: ChatResponse = self.call_llm(
             model="llama3.1",
             messages=[
                 {
@@ -142,92 +397,455 @@ class BlogOrchestrator:
         result = OrchestratorPlan.model_validate_json(response.message.content)
         return result
     
-    def write_section(self, topic: str, section: SubTask) -> SectionContent:
-        """Worker: Write a specific blog section with context from previous sections.
+    def write_section(
+        self, topic: str, section: SubTask, context: Optional[Dict[str, SectionContent]] = None
+    ) -> SectionContent:
+        """Worker: Write a specific blog section with context from the sections it depends on.
 
         Args:
             topic: The main blog topic
             section: SubTask containing section details
+            context: Written sections this section depends on, by section type
 
         Returns:
             SectionContent: The written content and key points
         """
-        # Create context from previously written sections
+        response: ChatResponse = self.call_llm(
+            model="llama3.1",
+            messages=self.section_messages(topic, section, context),
+            format=SectionContent.model_json_schema(),
+        )
+        result = SectionContent.model_validate_json(response.message.content)
+        return result
+
+    def section_messages(
+        self, topic: str, section: SubTask, context: Optional[Dict[str, SectionContent]] = None
+    ) -> List[Dict]:
+        """Worker prompt for a section, with context from the sections it depends on"""
+        # Create context from the sections this one builds on
         previous_sections = "\n\n".join(
             [
                 f"=== {section_type} ===\n{content.content}"
-                for section_type, content in self.sections_content.items()
+                for section_type, content in (context or {}).items()
+            ]
+        )
+        return [
+            {
+                "role": "system",
+                "content": WORKER_PROMPT.format(
+                    topic=topic,
+                    section_type=section.section_type,
+                    description=section.description,
+                    style_guide=section.style_guide,
+                    target_length=section.target_length,
+                    previous_sections=previous_sections
+                    if previous_sections
+                    else "None, this section stands on its own.",
+                ),
+            },
+        ]
+    
+    def write_sections(
+        self,
+        topic: str,
+        sections: List[SubTask],
+        completed: Optional[Dict[int, SectionContent]] = None,
+        on_section: Optional[Callable[[int, SectionContent], None]] = None,
+    ) -> List[SectionContent]:
+        """Write sections concurrently, starting each one once the sections it depends on are done.
+
+        Args:
+            topic: The main blog topic
+            sections: Sections of the plan
+            completed: Sections already written (e.g. restored from a checkpoint), by index
+            on_section: Called with the index and content of every newly written section
+
+        Returns:
+            List[SectionContent]: Written sections in plan order
+        """
+        dependencies = resolve_dependencies(sections)
+        labels = section_labels(sections)
+        results: List[Optional[SectionContent]] = [None] * len(sections)
+        for index, content in (completed or {}).items():
+            results[index] = content
+        waiting = {index for index in range(len(sections)) if results[index] is None}
+        running = {}  # future -> section index
+
+        error = None
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            while waiting or running:
+                ready = [i for i in sorted(waiting) if all(results[d] is not None for d in dependencies[i])]
+                for i in ready:
+                    waiting.remove(i)
+                    context = {labels[d]: results[d] for d in sorted(dependencies[i])}
+                    logger.info(f"Writing section: {sections[i].section_type}")
+                    running[executor.submit(self.write_section, topic, sections[i], context)] = i
+
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    i = running.pop(future)
+                    if future.cancelled():
+                        continue
+                    if future.exception() is not None:
+                        logger.error(f"Failed section: {sections[i].section_type}: {future.exception()}")
+                        if error is None:
+                            # Stop scheduling, but let sections already being written finish (and be saved)
+                            error = future.exception()
+                            waiting.clear()
+                            for other in running:
+                                other.cancel()
+                        continue
+                    results[i] = future.result()
+                    logger.info(f"Finished section: {sections[i].section_type}")
+                    if on_section:
+                        on_section(i, results[i])
+        if error is not None:
+            raise error
+        return results
+
+    def review_post(
+        self, topic: str, plan: OrchestratorPlan, sections_content: Dict[str, SectionContent]
+    ) -> ReviewFeedback:
+        """Reviewer: Analyze and improve overall cohesion"""
+        if self.review_mode == "edits":
+            return self.review_post_edits(topic, plan, sections_content)
+        if self.review_mode == "map_reduce":
+            return self.review_post_map_reduce(topic, plan, sections_content)
+        sections_text = "\n\n".join(
+            [
+                f"=== {section_type} ===\n{content.content}"
+                for section_type, content in sections_content.items()
             ]
         )
-        response: ChatResponse = chat(
+        response: ChatResponse = self.call_llm(
             model="llama3.1",
             messages=[
                 {
                     "role": "system",
-                    "content": WORKER_PROMPT.format(
+                    "content": REVIEWER_PROMPT.format(
                         topic=topic,
-                        section_type=section.section_type,
-                        description=section.description,
-                        style_guide=section.style_guide,
-                        target_length=section.target_length,
-                        previous_sections=previous_sections
-                        if previous_sections
-                        else "This is the first section.",
+                        audience=plan.target_audience,
+                        sections=sections_text,
                     ),
                 },
             ],
-            format=SectionContent.model_json_schema(),
+            format=ReviewFeedback.model_json_schema(),
         )
-        result = SectionContent.model_validate_json(response.message.content)
+        result = ReviewFeedback.model_validate_json(response.message.content)
         return result
-    
-    def review_post(self, topic: str, plan: OrchestratorPlan) -> ReviewFeedback:
-        """Reviewer: Analyze and improve overall cohesion"""
+
+    def review_post_edits(
+        self, topic: str, plan: OrchestratorPlan, sections_content: Dict[str, SectionContent]
+    ) -> ReviewFeedback:
+        """Reviewer: Return targeted edits only and build the final version locally.
+
+        The model writes a few short edits instead of the whole post again, which cuts the
+        slowest part of generation (output tokens) for long posts.
+        """
         sections_text = "\n\n".join(
             [
                 f"=== {section_type} ===\n{content.content}"
-                for section_type, content in self.sections_content.items()
+                for section_type, content in sections_content.items()
             ]
         )
-        response: ChatResponse = chat(
+        response: ChatResponse = self.call_llm(
             model="llama3.1",
             messages=[
                 {
                     "role": "system",
-                    "content": REVIEWER_PROMPT.format(
+                    "content": EDIT_REVIEWER_PROMPT.format(
                         topic=topic,
                         audience=plan.target_audience,
                         sections=sections_text,
                     ),
                 },
             ],
-            format=ReviewFeedback.model_json_schema(),
+            format=EditReview.model_json_schema(),
         )
-        result = ReviewFeedback.model_validate_json(response.message.content)
+        review = EditReview.model_validate_json(response.message.content)
+        edited = apply_edits(sections_content, review.edits)
+        return ReviewFeedback(
+            cohesion_score=review.cohesion_score,
+            suggested_edits=[
+                SuggestedEdits(section_name=edit.section_name, suggested_edit=edit.reason)
+                for edit in review.edits
+            ],
+            final_version="\n\n".join(edited.values()),
+        )
+
+    def review_chunk(
+        self, topic: str, plan: OrchestratorPlan, chunk: Dict[str, SectionContent]
+    ) -> ChunkReview:
+        """Map step: review one section or a pair of adjacent sections"""
+        sections_text = "\n\n".join(
+            [f"=== {section_type} ===\n{content.content}" for section_type, content in chunk.items()]
+        )
+        response: ChatResponse = self.call_llm(
+            model="llama3.1",
+            messages=[
+                {
+                    "role": "system",
+                    "content": CHUNK_REVIEWER_PROMPT.format(
+                        topic=topic,
+                        audience=plan.target_audience,
+                        sections=sections_text,
+                    ),
+                },
+            ],
+            format=ChunkReview.model_json_schema(),
+        )
+        result = ChunkReview.model_validate_json(response.message.content)
         return result
-    
+
+    def reduce_reviews(
+        self, topic: str, plan: OrchestratorPlan, reviews: List[ReviewSummary]
+    ) -> ReviewSummary:
+        """Reduce step: merge the findings of consecutive reviews into one"""
+        reviews_text = "\n\n".join(
+            [
+                f"=== Part {index + 1} (score {review.cohesion_score:.2f}) ===\n"
+                + "\n".join(f"- {finding}" for finding in review.findings)
+                for index, review in enumerate(reviews)
+            ]
+        )
+        response: ChatResponse = self.call_llm(
+            model="llama3.1",
+            messages=[
+                {
+                    "role": "system",
+                    "content": REDUCE_REVIEWER_PROMPT.format(
+                        topic=topic,
+                        audience=plan.target_audience,
+                        reviews=reviews_text,
+                    ),
+                },
+            ],
+            format=ReviewSummary.model_json_schema(),
+        )
+        result = ReviewSummary.model_validate_json(response.message.content)
+        return result
+
+    def review_post_map_reduce(
+        self, topic: str, plan: OrchestratorPlan, sections_content: Dict[str, SectionContent]
+    ) -> ReviewFeedback:
+        """Reviewer: Review adjacent section pairs in parallel, then merge findings level by level.
+
+        Every call sees at most two sections or reduce_fanout short summaries, so prompt size
+        stays bounded however long the post is.
+        """
+        names = list(sections_content)
+        # Overlapping pairs cover every section and every transition between them
+        chunks = [names[i : i + 2] for i in range(max(1, len(names) - 1))]
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            chunk_reviews = list(
+                executor.map(
+                    lambda chunk: self.review_chunk(
+                        topic, plan, {name: sections_content[name] for name in chunk}
+                    ),
+                    chunks,
+                )
+            )
+            summaries = [
+                ReviewSummary(cohesion_score=review.transition_score, findings=review.findings)
+                for review in chunk_reviews
+            ]
+            while len(summaries) > 1:
+                groups = [
+                    summaries[i : i + self.reduce_fanout]
+                    for i in range(0, len(summaries), self.reduce_fanout)
+                ]
+                logger.info(f"Reducing {len(summaries)} reviews in {len(groups)} groups")
+                summaries = list(
+                    executor.map(
+                        lambda group: group[0] if len(group) == 1 else self.reduce_reviews(topic, plan, group),
+                        groups,
+                    )
+                )
+
+        edits = [edit for review in chunk_reviews for edit in review.edits]
+        edited = apply_edits(sections_content, edits)
+        return ReviewFeedback(
+            cohesion_score=summaries[0].cohesion_score,
+            suggested_edits=[
+                SuggestedEdits(section_name=edit.section_name, suggested_edit=edit.reason)
+                for edit in edits
+            ],
+            final_version="\n\n".join(edited.values()),
+        )
+
+    def load_checkpoint(self, job_id: Optional[str], step: str, model: type[BaseModel]):
+        """Return the saved result of a step, or None when there is nothing to resume"""
+        if not (self.checkpoint_store and job_id):
+            return None
+        data = self.checkpoint_store.load(job_id, step)
+        if data is None:
+            return None
+        logger.info(f"Resuming job {job_id}: reusing checkpointed {step}")
+        return model.model_validate_json(data)
+
+    def save_checkpoint(self, job_id: Optional[str], step: str, result: BaseModel):
+        if self.checkpoint_store and job_id:
+            self.checkpoint_store.save(job_id, step, result.model_dump_json())
+
+    def check_request(self, job_id: Optional[str], topic: str, target_length: int, style: str):
+        """Refuse to resume a job id with different inputs, and record the inputs of a new job"""
+        if not (self.checkpoint_store and job_id):
+            return
+        request = json.dumps({"topic": topic, "target_length": target_length, "style": style})
+        saved_request = self.checkpoint_store.load(job_id, "request")
+        if saved_request is not None and saved_request != request:
+            raise ValueError(f"Job {job_id} was started with different inputs: {saved_request}")
+        self.checkpoint_store.save(job_id, "request", request)
+
     def write_blog(
-        self, topic: str, target_length: int = 1000, style: str = "informative"
+        self,
+        topic: str,
+        target_length: int = 1000,
+        style: str = "informative",
+        job_id: Optional[str] = None,
+        progress: Optional[JobProgress] = None,
     ) -> Dict:
-        """Process the entire blog writing task"""
+        """Process the entire blog writing task, resuming job_id from its checkpoints if given.
+
+        All state of the run lives in local variables, so concurrent calls do not interfere.
+        """
         logger.info(f"Starting blog writing process for: {topic}")
+        progress = progress or JobProgress(job_id=job_id or "", topic=topic)
+
+        self.check_request(job_id, topic, target_length, style)
 
         # Get blog structure plan
-        plan = self.get_plan(topic, target_length, style)
+        progress.status = "planning"
+        plan = self.load_checkpoint(job_id, "plan", OrchestratorPlan)
+        if plan is None:
+            plan = self.get_plan(topic, target_length, style)
+            self.save_checkpoint(job_id, "plan", plan)
         logger.info(f"Blog structure planned: {len(plan.sections)} sections")
         logger.info(f"Blog structure planned: {plan.model_dump_json(indent=2)}")
 
-        # Write each section
-        for section in plan.sections:
-            logger.info(f"Writing section: {section.section_type}")
-            content = self.write_section(topic, section)
-            self.sections_content[section.section_type] = content
+        # Write the sections in parallel, results come back in plan order
+        completed = {}
+        for index in range(len(plan.sections)):
+            content = self.load_checkpoint(job_id, f"section-{index}", SectionContent)
+            if content is not None:
+                completed[index] = content
+        progress.status = "writing"
+        progress.sections_total = len(plan.sections)
+        progress.sections_done = len(completed)
 
-        # Review and polish
-        logger.info("Reviewing full blog post")
-        review = self.review_post(topic, plan)
+        def on_section(index: int, content: SectionContent):
+            self.save_checkpoint(job_id, f"section-{index}", content)
+            progress.sections_done += 1
 
-        return {"structure": plan, "sections": self.sections_content, "review": review}
+        contents = self.write_sections(topic, plan.sections, completed=completed, on_section=on_section)
+        # Keyed by unique label, so two sections of the same type do not overwrite each other
+        sections_content = dict(zip(section_labels(plan.sections), contents))
+
+        # Review and polish
+        progress.status = "reviewing"
+        review_step = f"review-{self.review_mode}"
+        review = self.load_checkpoint(job_id, review_step, ReviewFeedback)
+        if review is None:
+            logger.info("Reviewing full blog post")
+            review = self.review_post(topic, plan, sections_content)
+            self.save_checkpoint(job_id, review_step, review)
+        progress.status = "done"
+
+        return {"structure": plan, "sections": sections_content, "review": review}
+
+    async def stream_blog(
+        self,
+        topic: str,
+        target_length: int = 1000,
+        style: str = "informative",
+        job_id: Optional[str] = None,
+    ) -> AsyncIterator[BlogEvent]:
+        """Same job as write_blog, but yields events as soon as each part is ready.
+
+        Section tokens are streamed from the model while independent sections are written
+        concurrently, so the first content shows up long before the whole post is done.
+        """
+        logger.info(f"Starting streamed blog writing process for: {topic}")
+        self.check_request(job_id, topic, target_length, style)
+
+        plan = self.load_checkpoint(job_id, "plan", OrchestratorPlan)
+        if plan is None:
+            plan = await asyncio.to_thread(self.get_plan, topic, target_length, style)
+            self.save_checkpoint(job_id, "plan", plan)
+        yield PlanReady(plan=plan)
+
+        sections = plan.sections
+        dependencies = resolve_dependencies(sections)
+        labels = section_labels(sections)
+        loop = asyncio.get_running_loop()
+        written = [loop.create_future() for _ in sections]
+        events: asyncio.Queue = asyncio.Queue()
+        semaphore = asyncio.Semaphore(self.max_workers)
+        client = AsyncClient()
+
+        async def write(index: int):
+            section = sections[index]
+            content = self.load_checkpoint(job_id, f"section-{index}", SectionContent)
+            if content is None:
+                context = {labels[d]: await written[d] for d in sorted(dependencies[index])}
+                async with semaphore:
+                    # Also take a slot of the orchestrator-wide cap shared with other jobs
+                    await self.acquire_llm_slot()
+                    try:
+                        output = ""
+                        # Structured output is streamed as JSON, only the content text goes to the consumer
+                        content_stream = JsonStringFieldStream("content")
+                        stream = await client.chat(
+                            model="llama3.1",
+                            messages=self.section_messages(topic, section, context),
+                            format=SectionContent.model_json_schema(),
+                            stream=True,
+                        )
+                        async for chunk in stream:
+                            output += chunk.message.content
+                            token = content_stream.feed(chunk.message.content)
+                            if token:
+                                await events.put(
+                                    SectionToken(index=index, section_type=section.section_type, token=token)
+                                )
+                    finally:
+                        self.llm_slots.release()
+                content = SectionContent.model_validate_json(output)
+                self.save_checkpoint(job_id, f"section-{index}", content)
+            written[index].set_result(content)
+            await events.put(SectionCompleted(index=index, section_type=section.section_type, content=content))
+
+        async def run_writer(index: int):
+            try:
+                await write(index)
+            except Exception as e:
+                await events.put(e)  # surfaced to the consumer below
+
+        tasks = [asyncio.create_task(run_writer(index)) for index in range(len(sections))]
+        try:
+            completed = 0
+            while completed < len(sections):
+                event = await events.get()
+                if isinstance(event, Exception):
+                    raise event
+                if isinstance(event, SectionCompleted):
+                    completed += 1
+                yield event
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            await client.close()
+
+        sections_content = {label: future.result() for label, future in zip(labels, written)}
+
+        review_step = f"review-{self.review_mode}"
+        review = self.load_checkpoint(job_id, review_step, ReviewFeedback)
+        if review is None:
+            logger.info("Reviewing full blog post")
+            review = await asyncio.to_thread(self.review_post, topic, plan, sections_content)
+            self.save_checkpoint(job_id, review_step, review)
+        yield ReviewCompleted(review=review)
 
 
 # --------------------------------------------------------------
@@ -235,12 +853,15 @@ class BlogOrchestrator:
 # --------------------------------------------------------------
 
 if __name__ == "__main__":
-    orchestrator = BlogOrchestrator()
+    orchestrator = BlogOrchestrator(
+        review_mode="edits", checkpoint_store=DirectoryCheckpointStore("checkpoints")
+    )
 
     # Example: Technical blog post
     topic = "The impact of AI on software engineering"
+    # Rerunning with the same job id resumes from the last completed step
     result = orchestrator.write_blog(
-        topic=topic, target_length=1200, style="technical but accessible"
+        topic=topic, target_length=1200, style="technical but accessible", job_id="ai-software-engineering"
     )
 
     print("\nFinal Blog Post:")
@@ -250,4 +871,16 @@ if __name__ == "__main__":
     if result["review"].suggested_edits:
         for edit in result["review"].suggested_edits:
             print(f"Section: {edit.section_name}")
-            print(f"Suggested Edit: {edit.suggested_edit}")
\ No newline at end of file
+            print(f"Suggested Edit: {edit.suggested_edit}")
+
+    # Example: Streamed blog post, sections are shown as soon as they are written
+    async def print_streamed_blog(topic: str):
+        async for event in orchestrator.stream_blog(topic=topic, target_length=800, style="conversational"):
+            if isinstance(event, PlanReady):
+                print(f"\nPlan ready: {[section.section_type for section in event.plan.sections]}")
+            elif isinstance(event, SectionCompleted):
+                print(f"\n=== {event.section_type} ===\n{event.content.content}")
+            elif isinstance(event, ReviewCompleted):
+                print(f"\nReview done, cohesion score: {event.review.cohesion_score}")
+
+    asyncio.run(print_streamed_blog("How to run local LLMs with Ollama"))
\ No newline at end of file
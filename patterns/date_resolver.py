@@ -0,0 +1,230 @@
+import logging
+import re
+from datetime import date, datetime, time, timedelta
+from typing import Optional
+from pydantic import BaseModel, Field
+
+logger = logging.getLogger(__name__)
+
+# --------------------------------------------------------------
+# Local resolver for relative dates and times
+# --------------------------------------------------------------
+
+WEEKDAYS = ["monday", "tuesday", "wednesday", "thursday", "friday", "saturday", "sunday"]
+MONTHS = ["jan", "feb", "mar", "apr", "may", "jun", "jul", "aug", "sep", "oct", "nov", "dec"]
+# Full names, or abbreviations with a dot: a bare "Jun" or "Jan" is more often a person's name
+MONTH_NAMES = (
+    r"january|february|march|april|may|june|july|august|september|october|november|december"
+    r"|(?:jan|feb|mar|apr|jun|jul|aug|sept?|oct|nov|dec)\."
+)
+COUNT_WORDS = {"a": 1, "an": 1, "one": 1, "two": 2, "three": 3, "four": 4, "five": 5, "six": 6, "seven": 7}
+
+DATE_EXPRESSION = re.compile(
+    r"\b(?:on\s+)?(?:"
+    r"(?P<relative>the day after tomorrow|today|tonight|tomorrow)"
+    # M/D needs date context (checked in _resolve_date) and must not be a fraction such as "1/2 hour"
+    r"|(?:(?P<slash_weekday>" + "|".join(WEEKDAYS) + r"),?\s+)?(?<![\d.])(?P<slash_month>\d{1,2})/(?P<slash_day>\d{1,2})"
+    r"(?:/(?P<slash_year>\d{4}))?(?!\d|\s*(?:hours?|hrs?|h\b|min))"
+    r"|(?:(?P<qualifier>this|next)\s+)?(?P<weekday>" + "|".join(WEEKDAYS) + r")"
+    r"|in\s+(?P<count>\d+|" + "|".join(COUNT_WORDS) + r")\s+(?P<unit>days?|weeks?)"
+    r"|(?P<next_week>next week)"
+    r"|(?P<iso>\d{4}-\d{2}-\d{2})"
+    r"|(?P<month>" + MONTH_NAMES + r")\s+(?P<month_day>\d{1,2})(?:st|nd|rd|th)?"
+    r"|(?P<day_month>\d{1,2})(?:st|nd|rd|th)?\s+(?:of\s+)?(?P<month_after>" + MONTH_NAMES + r")"
+    r")\b",
+    re.IGNORECASE,
+)
+TIME_EXPRESSION = re.compile(
+    r"\b(?:at\s+)?(?:"
+    r"(?<![\d.:])(?P<hour>\d{1,2})(?:[:.](?P<minute>\d{2}))?\s*(?P<meridiem>am|pm|a\.m\.|p\.m\.)(?!\w)"
+    r"|(?<![\d.:])(?P<hour24>[01]?\d|2[0-3]):(?P<minute24>[0-5]\d)(?![\w:])"
+    r"|(?P<word>noon|midnight)\b"
+    r")",
+    re.IGNORECASE,
+)
+
+
+class TemporalResolution(BaseModel):
+    """Dates and times found in an input, resolved against a reference day"""
+
+    normalized_text: str = Field(description="Input with every temporal expression rewritten as ISO 8601")
+    date: Optional[str] = Field(default=None, description="The single date mentioned, ISO 8601")
+    time: Optional[str] = Field(default=None, description="The single time mentioned, HH:MM")
+    datetime: Optional[str] = Field(default=None, description="Date and time combined, if both are known")
+    ambiguous: bool = Field(default=False, description="More than one date or time expression was found")
+
+
+def _resolve_date(match: re.Match, today: date) -> Optional[date]:
+    """The date a match refers to, or None if the match is not a date after all"""
+    groups = {name: value.lower() for name, value in match.groupdict().items() if value}
+    after_on = match.group(0).lower().startswith("on ")
+    if "slash_month" in groups:
+        # "agenda item 2/3" is not a date, "on 2/3", "Tuesday 2/3" and "2/3/2027" are
+        if not (after_on or "slash_weekday" in groups or "slash_year" in groups):
+            return None
+        month, day = int(groups["slash_month"]), int(groups["slash_day"])  # US style M/D
+        if "slash_year" in groups:
+            return date(int(groups["slash_year"]), month, day)
+        resolved = date(today.year, month, day)
+        return resolved if resolved >= today else date(today.year + 1, month, day)
+    if "relative" in groups:
+        offsets = {"today": 0, "tonight": 0, "tomorrow": 1, "the day after tomorrow": 2}
+        return today + timedelta(days=offsets[groups["relative"]])
+    if "weekday" in groups:
+        # Bare or "this" weekday: the next one on or after today; "next" weekday: the next one after today
+        days_ahead = (WEEKDAYS.index(groups["weekday"]) - today.weekday()) % 7
+        if days_ahead == 0 and groups.get("qualifier") == "next":
+            days_ahead = 7
+        return today + timedelta(days=days_ahead)
+    if "count" in groups:
+        count = int(groups["count"]) if groups["count"].isdigit() else COUNT_WORDS[groups["count"]]
+        return today + timedelta(days=count * (7 if groups["unit"].startswith("week") else 1))
+    if "next_week" in groups:
+        return today + timedelta(days=7 - today.weekday())  # Monday of next week
+    if "iso" in groups:
+        return date.fromisoformat(groups["iso"])
+    month_name = groups.get("month") or groups["month_after"]
+    if month_name == "may" and not (after_on and "month" in groups):
+        return None  # "I may 5 people": only "on May 5" is read as a date
+    month = MONTHS.index(month_name[:3]) + 1
+    day = int(groups.get("month_day") or groups["day_month"])
+    # A date without a year is the next occurrence of it
+    resolved = date(today.year, month, day)
+    return resolved if resolved >= today else date(today.year + 1, month, day)
+
+
+def _resolve_time(match: re.Match) -> Optional[time]:
+    """The time a match refers to, or None if it cannot be told without am/pm"""
+    if match.group("word"):
+        return time(12, 0) if match.group("word").lower() == "noon" else time(0, 0)
+    if match.group("hour24"):
+        hour = match.group("hour24")
+        # "15:00" and "09:30" are 24-hour times, but "3:00" could be 3am or 3pm
+        if int(hour) < 13 and not hour.startswith("0"):
+            return None
+        return time(int(hour), int(match.group("minute24")))
+    hour = int(match.group("hour")) % 12
+    if match.group("meridiem").lower().startswith("p"):
+        hour += 12
+    return time(hour, int(match.group("minute") or 0))
+
+
+def resolve_temporal_expressions(text: str, today: Optional[date] = None) -> TemporalResolution:
+    """Rewrite relative dates and times as ISO 8601, so the LLM only has to copy them"""
+    today = today or date.today()
+    dates, times = [], []
+
+    def replace_date(match: re.Match) -> str:
+        try:
+            resolved = _resolve_date(match, today)
+        except ValueError:  # e.g. February 30
+            resolved = None
+        if resolved is None:
+            return match.group(0)
+        dates.append(resolved)
+        # "next Tuesday" -> "on 2026-10-27", but "before June 12" -> "before 2026-06-12"
+        explicit = any(match.group(name) for name in ("iso", "month", "month_after", "slash_month"))
+        prefix = "on " if match.group(0).lower().startswith("on ") or not explicit else ""
+        return f"{prefix}{resolved.isoformat()}"
+
+    def replace_time(match: re.Match) -> str:
+        try:
+            resolved = _resolve_time(match)
+        except ValueError:  # e.g. 13pm
+            resolved = None
+        if resolved is None:
+            return match.group(0)
+        times.append(resolved)
+        prefix = "at " if match.group(0).lower().startswith("at ") else ""
+        return f"{prefix}{resolved.strftime('%H:%M')}"
+
+    normalized = TIME_EXPRESSION.sub(replace_time, DATE_EXPRESSION.sub(replace_date, text))
+    # Several date or time expressions leave the choice to the LLM, only the rewritten text helps then
+    resolved_date = dates[0] if len(dates) == 1 else None
+    resolved_time = times[0] if len(times) == 1 else None
+    result = TemporalResolution(
+        normalized_text=normalized,
+        date=resolved_date.isoformat() if resolved_date else None,
+        time=resolved_time.strftime("%H:%M") if resolved_time else None,
+        datetime=datetime.combine(resolved_date, resolved_time).isoformat() if resolved_date and resolved_time else None,
+        ambiguous=len(dates) > 1 or len(times) > 1,
+    )
+    logger.debug(f"Resolved temporal expressions: {result.model_dump()}")
+    return result
+
+
+def validate_event_datetime(value: str, resolution: TemporalResolution) -> str:
+    """Check the LLM's ISO 8601 datetime against what was resolved locally.
+
+    The local result only wins when exactly one date (and at most one time) expression was found;
+    otherwise the LLM's value is kept.
+    """
+    try:
+        parsed = datetime.fromisoformat(value)
+    except ValueError:
+        parsed = None
+
+    if resolution.ambiguous:
+        logger.info(f"Several temporal expressions in the input, keeping LLM datetime {value!r}")
+        return value
+    if resolution.datetime:
+        expected = datetime.fromisoformat(resolution.datetime)
+        if parsed is None or parsed.replace(tzinfo=None) != expected:
+            logger.warning(f"Replacing LLM datetime {value!r} with locally resolved {resolution.datetime}")
+        return resolution.datetime
+    if resolution.date and parsed is not None and parsed.date().isoformat() != resolution.date:
+        # Keep the LLM's time of day, but on the locally resolved date
+        corrected = datetime.combine(date.fromisoformat(resolution.date), parsed.time())
+        logger.warning(f"Replacing LLM datetime {value!r} with {corrected.isoformat()}")
+        return corrected.isoformat()
+    if parsed is None:
+        logger.warning(f"LLM datetime {value!r} is not valid ISO 8601 and could not be resolved locally")
+        return value
+    return parsed.isoformat()
+
+
+def date_context(today: Optional[date] = None) -> str:
+    """Day-granularity reference for prompts, identical all day so the prompt prefix can be cached"""
+    return f"Today is {(today or date.today()).strftime('%A, %B %d, %Y')}."
+
+
+if __name__ == "__main__":
+    today = date(2026, 10, 18)  # a Sunday
+    # (input, expected datetime or date, None if nothing may be resolved)
+    cases = [
+        ("Let's schedule a 1h team meeting next Tuesday at 2pm with Alice and Bob", "2026-10-20T14:00:00"),
+        ("Book a 30 minute call with Carol tomorrow at 9:30am about the budget.", "2026-10-19T09:30:00"),
+        ("Dentist appointment on 3/14 at 08:15", "2027-03-14T08:15:00"),
+        ("Deploy freeze starts Friday at 18:30", "2026-10-23T18:30:00"),
+        ("Review on Tuesday 11/3/2026 at 4 p.m.", "2026-11-03T16:00:00"),
+        ("Lunch with Dave on June 12 at noon", "2027-06-12T12:00:00"),
+        ("Workshop in two weeks", "2026-11-01"),
+        ("Planning on May 5 at 10am", "2027-05-05T10:00:00"),
+        # Regressions: none of these are dates (and 9.30am is a time)
+        ("Book a 1/2 hour call with Bob at 3pm", None),
+        ("Standup at 9.30am tomorrow", "2026-10-19T09:30:00"),
+        ("agenda item 2/3", None),
+        ("I may 5 people", None),
+        # A bare H:MM without am/pm is left to the LLM, only the date is resolved
+        ("Team sync tomorrow at 3:00 with Alice", "2026-10-19"),
+        ("retro on Friday at 4:30", "2026-10-23"),
+        # "Jun" here is a person; "Jun. 5" and "June 5" are dates
+        ("dinner with Jun 5 at 7pm", None),
+        ("Offsite on Jun. 5 at 9am", "2027-06-05T09:00:00"),
+    ]
+    for text, expected in cases:
+        resolution = resolve_temporal_expressions(text, today)
+        resolved = resolution.datetime or resolution.date
+        print(f"{text}\n  -> {resolution.normalized_text}\n  -> {resolved}")
+        if expected is None:
+            assert resolution.date is None, f"{text!r} resolved to {resolved}"
+        else:
+            assert resolved == expected, f"{text!r} resolved to {resolved}, expected {expected}"
+    # Several expressions: the LLM's answer is kept
+    resolution = resolve_temporal_expressions("Move it from Monday to Friday at 2pm", today)
+    assert validate_event_datetime("2026-10-23T14:00:00", resolution) == "2026-10-23T14:00:00"
+    # No time resolved locally: the LLM's afternoon time is kept on the resolved date
+    resolution = resolve_temporal_expressions("Team sync tomorrow at 3:00 with Alice", today)
+    assert "at 3:00" in resolution.normalized_text
+    assert validate_event_datetime("2026-10-19T15:00:00", resolution) == "2026-10-19T15:00:00"
+    print("All cases passed")
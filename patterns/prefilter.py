@@ -0,0 +1,320 @@
+import json
+import logging
+import math
+import re
+import time
+from collections import Counter
+from typing import Literal, Optional
+from pydantic import BaseModel, Field
+
+logger = logging.getLogger(__name__)
+
+# --------------------------------------------------------------
+# Local pre-filter: settle obvious calendar requests without an LLM call
+# --------------------------------------------------------------
+
+TIME_PATTERN = re.compile(r"\b(\d{1,2}(:\d{2})?\s?(am|pm)|\d{1,2}:\d{2}|noon|midnight|tonight)\b")
+DATE_PATTERN = re.compile(
+    r"\b(today|tomorrow|(next|this|every)\s+(week|month|\w+day)|monday|tuesday|wednesday|thursday|friday|saturday|sunday"
+    r"|jan(uary)?|feb(ruary)?|mar(ch)?|apr(il)?|may|june?|july?|aug(ust)?|sept?(ember)?|oct(ober)?|nov(ember)?|dec(ember)?"
+    r"|\d{4}-\d{2}-\d{2}|\d{1,2}/\d{1,2})\b"
+)
+DURATION_PATTERN = re.compile(r"\b(\d+(\.\d+)?\s?(h|hr|hrs|hours?|m|min|mins|minutes?)|half an hour|an hour)\b")
+CALENDAR_PATTERN = re.compile(
+    r"\b(schedule|book|meeting|meet|call|appointment|calendar|event|invite|standup|sync|lunch|dinner|interview|demo|workshop)\b"
+)
+# The request's leading verb, after an optional polite opener ("Can you", "Please", "Let's", ...)
+LEADING_VERB_PATTERN = re.compile(
+    r"^\s*(?:(?:can|could|would|will)\s+(?:you|we)\s+|please\s+|let's\s+|i'd like to\s+|i want to\s+|i need to\s+)*"
+    r"(?P<verb>[a-z]+)(?:\s+(?P<next>[a-z]+))?"
+)
+CREATE_VERBS = {"schedule", "book", "set", "arrange", "organize", "plan", "create", "put", "meet", "add"}
+MODIFY_VERBS = {"move", "reschedule", "change", "push", "postpone", "cancel", "shift", "rename", "remove", "delay"}
+NEGATIVE_PATTERN = re.compile(
+    r"\b(email|e-mail|send|weather|write|summari[sz]e|translate|explain|joke|recipe|code|search)\b"
+)
+PARTICIPANT_PATTERN = re.compile(r"\bwith\s+[A-Z][a-z]+")
+
+# Log-odds weights of the rule features, hand-tuned on TUNING_EXAMPLES
+RULE_WEIGHTS = {
+    "bias": -2.0,
+    "time": 2.0,
+    "date": 1.0,
+    "duration": 1.0,
+    "calendar": 2.5,
+    "participants": 0.5,
+    "negative": -3.0,
+}
+
+
+def rule_features(text: str) -> dict[str, bool]:
+    """Which of the keyword and time-expression rules fire for the text"""
+    lowered = text.lower()
+    return {
+        "time": bool(TIME_PATTERN.search(lowered)),
+        "date": bool(DATE_PATTERN.search(lowered)),
+        "duration": bool(DURATION_PATTERN.search(lowered)),
+        "calendar": bool(CALENDAR_PATTERN.search(lowered)),
+        "participants": bool(PARTICIPANT_PATTERN.search(text)),
+        "negative": bool(NEGATIVE_PATTERN.search(lowered)),
+    }
+
+
+def route_from_leading_verb(text: str) -> Optional[str]:
+    """new_event / modify_event when the request opens with a clear creation or change verb, else None.
+
+    Only the leading verb counts: "Book a call ... to cancel my gym subscription" is a new event.
+    """
+    match = LEADING_VERB_PATTERN.match(text.lower())
+    if match is None:
+        return None
+    verb = match.group("verb")
+    if verb == "add":
+        # "Add a standup ..." creates an event, "Add Grace to the meeting" changes one
+        return "new_event" if match.group("next") in ("a", "an") else "modify_event"
+    if verb in MODIFY_VERBS:
+        return "modify_event"
+    if verb in CREATE_VERBS:
+        return "new_event"
+    return None
+
+
+def rule_score(features: dict[str, bool]) -> float:
+    """Probability that the input is a calendar request, from the rule features alone"""
+    z = RULE_WEIGHTS["bias"] + sum(
+        weight for name, weight in RULE_WEIGHTS.items() if name != "bias" and features[name]
+    )
+    return 1 / (1 + math.exp(-z))
+
+
+class NaiveBayesModel:
+    """Tiny multinomial naive Bayes over words plus the rule features, trained on labeled examples"""
+
+    def __init__(self, alpha: float = 1.0):
+        self.alpha = alpha
+        self.word_counts = {True: Counter(), False: Counter()}
+        self.doc_counts = {True: 0, False: 0}
+
+    @staticmethod
+    def tokens(text: str) -> list[str]:
+        words = re.findall(r"[a-z0-9']+", text.lower())
+        return words + [f"__{name}__" for name, fired in rule_features(text).items() if fired]
+
+    def fit(self, examples: list[tuple[str, bool]]) -> "NaiveBayesModel":
+        for text, is_calendar in examples:
+            self.doc_counts[is_calendar] += 1
+            self.word_counts[is_calendar].update(self.tokens(text))
+        return self
+
+    def predict_proba(self, text: str) -> float:
+        """Probability that the input is a calendar request"""
+        vocabulary = len(set(self.word_counts[True]) | set(self.word_counts[False]))
+        total_docs = sum(self.doc_counts.values())
+        log_probs = {}
+        for label in (True, False):
+            total_words = sum(self.word_counts[label].values())
+            log_prob = math.log((self.doc_counts[label] + 1) / (total_docs + 2))
+            for token in self.tokens(text):
+                log_prob += math.log(
+                    (self.word_counts[label][token] + self.alpha) / (total_words + self.alpha * vocabulary)
+                )
+            log_probs[label] = log_prob
+        return 1 / (1 + math.exp(min(log_probs[False] - log_probs[True], 700)))
+
+    def save(self, path: str):
+        with open(path, "w") as f:
+            json.dump(
+                {
+                    "alpha": self.alpha,
+                    "doc_counts": {str(label): count for label, count in self.doc_counts.items()},
+                    "word_counts": {str(label): dict(counts) for label, counts in self.word_counts.items()},
+                },
+                f,
+            )
+
+    @classmethod
+    def load(cls, path: str) -> "NaiveBayesModel":
+        with open(path, "r") as f:
+            data = json.load(f)
+        model = cls(alpha=data["alpha"])
+        model.doc_counts = {label == "True": count for label, count in data["doc_counts"].items()}
+        model.word_counts = {label == "True": Counter(counts) for label, counts in data["word_counts"].items()}
+        return model
+
+
+class PrefilterDecision(BaseModel):
+    """Outcome of the local pre-filter for one input"""
+
+    action: Literal["reject", "accept", "defer"] = Field(
+        description="reject: clearly not a calendar request, accept: clearly one, defer: ask the LLM"
+    )
+    score: float = Field(description="Probability that the input is a calendar request")
+    request_type: Optional[Literal["new_event", "modify_event"]] = Field(
+        default=None, description="Route for accepted inputs, None when the LLM router has to decide"
+    )
+
+
+class Prefilter:
+    """Rejects clear negatives and accepts clear positives locally, defers the ambiguous band to the LLM.
+
+    Raise reject_below / lower accept_above to send fewer inputs to the LLM, at the cost of precision.
+    The thresholds only decide calendar or not; an accepted input gets a route only when its leading
+    verb is a clear creation or change verb, otherwise the router LLM still picks new vs modify.
+    """
+
+    def __init__(
+        self,
+        reject_below: float = 0.05,
+        accept_above: float = 0.95,
+        model: Optional[NaiveBayesModel] = None,
+    ):
+        self.reject_below = reject_below
+        self.accept_above = accept_above
+        self.model = model
+        self.decisions = Counter()
+
+    def classify(self, user_input: str) -> PrefilterDecision:
+        features = rule_features(user_input)
+        score = rule_score(features)
+        if self.model is not None:
+            score = (score + self.model.predict_proba(user_input)) / 2
+        if score < self.reject_below:
+            decision = PrefilterDecision(action="reject", score=score)
+        elif score > self.accept_above:
+            decision = PrefilterDecision(
+                action="accept", score=score, request_type=route_from_leading_verb(user_input)
+            )
+        else:
+            decision = PrefilterDecision(action="defer", score=score)
+        self.decisions[decision.action] += 1
+        logger.debug(f"Pre-filter: {decision.action} (score {score:.3f})")
+        return decision
+
+    def stats(self) -> dict:
+        total = sum(self.decisions.values())
+        return {
+            "inputs": total,
+            **dict(self.decisions),
+            "llm_gate_skipped": (total - self.decisions["defer"]) / total if total else 0.0,
+        }
+
+
+# --------------------------------------------------------------
+# Evaluation harness
+# --------------------------------------------------------------
+
+# (input, label) with label "new_event", "modify_event" or "other"
+# The rule weights were tuned and the naive Bayes model is trained on these, so they only show fit
+TUNING_EXAMPLES = [
+    ("Let's schedule a 1h team meeting next Tuesday at 2pm with Alice and Bob to discuss the project roadmap.", "new_event"),
+    ("Book a 30 minute call with Carol tomorrow at 9am about the budget.", "new_event"),
+    ("Set up a lunch with Dave on Friday at noon", "new_event"),
+    ("Schedule a demo for the client on June 12 at 10:30", "new_event"),
+    ("Add a standup every Monday at 9am for the whole team", "new_event"),
+    ("Can we meet next week to go over the design?", "new_event"),
+    ("Put an interview with the new candidate on my calendar for Thursday 4pm", "new_event"),
+    ("Dentist appointment on 3/14 at 8:15am", "new_event"),
+    ("Plan a two hour workshop with Erin and Frank next Wednesday", "new_event"),
+    ("I need a sync with the design team sometime tomorrow", "new_event"),
+    ("Can you move the team meeting with Alice and Bob to Wednesday at 3pm instead?", "modify_event"),
+    ("Reschedule my call with Carol to Monday at 11am", "modify_event"),
+    ("Push the standup back by 30 minutes tomorrow", "modify_event"),
+    ("Cancel the demo on Friday", "modify_event"),
+    ("Add Grace to the roadmap meeting next Tuesday", "modify_event"),
+    ("Change the interview to 5pm", "modify_event"),
+    ("Can you send an email to Alice and Bob to discuss the project roadmap?", "other"),
+    ("What's the weather like today?", "other"),
+    ("Write a haiku about autumn", "other"),
+    ("Summarize this article for me", "other"),
+    ("Translate 'good morning' into French", "other"),
+    ("Tell me a joke", "other"),
+    ("What is the capital of Australia?", "other"),
+    ("Explain how a hash map works", "other"),
+    ("Send the quarterly report to finance", "other"),
+    ("Find me a recipe for lasagna", "other"),
+    ("How many days until Christmas?", "other"),
+    ("Remind me what we discussed about the roadmap", "other"),
+]
+
+# Never used for tuning or training: the rates measured on these are the ones to trust
+HELD_OUT_EXAMPLES = [
+    ("Set up a 45 min one-on-one with Priya on Thursday at 10am", "new_event"),
+    ("Block two hours on Friday afternoon for the quarterly review", "new_event"),
+    ("Can you arrange a coffee chat with Sam next Monday?", "new_event"),
+    ("Create an event called Launch Party on 2026-11-20 at 6pm", "new_event"),
+    ("Organize a team offsite for the first week of December", "new_event"),
+    ("I'd like to get together with Omar tomorrow around lunchtime", "new_event"),
+    ("Schedule a call with the vendor at 3:30pm today", "new_event"),
+    ("Move my 1:1 with Priya from Thursday to Friday", "modify_event"),
+    ("Can we postpone the launch party by a week?", "modify_event"),
+    ("Please cancel tomorrow's standup", "modify_event"),
+    ("Shift the quarterly review to start at 2pm", "modify_event"),
+    ("Invite Omar to the offsite planning meeting", "modify_event"),
+    ("Email Priya the notes from our last meeting", "other"),
+    ("What time is it in Tokyo right now?", "other"),
+    ("Draft a thank-you note for the team", "other"),
+    ("How do I set up a Python virtual environment?", "other"),
+    ("Give me three ideas for a team building activity", "other"),
+    ("What did the meeting notes say about the budget?", "other"),
+    ("Convert 5pm Eastern to Pacific time", "other"),
+    ("Write a short poem about Mondays", "other"),
+    # Change words used as nouns or inside a new-event request must not route to modify
+    ("Schedule a meeting with Bob tomorrow at 2pm to discuss the change request", "new_event"),
+    ("Book a call with Carol tomorrow at 9am to cancel my gym subscription", "new_event"),
+    ("Team meeting with Dan tomorrow at 10am about the push notification launch", "new_event"),
+    ("Can you reschedule tomorrow's 2pm call with Carol to 4pm?", "modify_event"),
+    ("Cancel the 3pm interview with Erin tomorrow", "modify_event"),
+]
+
+
+def evaluate(prefilter: Prefilter, examples: list[tuple[str, str]] = HELD_OUT_EXAMPLES) -> dict:
+    """Measure false-reject rate (calendar requests rejected locally), false accepts and routing errors.
+
+    Defaults to the held-out set; evaluating on TUNING_EXAMPLES only shows how well the rules fit them.
+    """
+    positives = sum(1 for _, label in examples if label != "other")
+    negatives = len(examples) - positives
+    false_rejects, false_accepts, wrong_routes, deferred, routed = [], [], [], 0, 0
+    start = time.perf_counter()
+    decisions = [prefilter.classify(text) for text, _ in examples]
+    elapsed = time.perf_counter() - start
+    for (text, label), decision in zip(examples, decisions):
+        if decision.action == "defer":
+            deferred += 1
+        elif decision.action == "reject" and label != "other":
+            false_rejects.append(text)
+        elif decision.action == "accept" and label == "other":
+            false_accepts.append(text)
+        elif decision.action == "accept" and decision.request_type is not None:
+            routed += 1
+            if decision.request_type != label:
+                wrong_routes.append(text)
+    return {
+        "false_reject_rate": len(false_rejects) / positives if positives else 0.0,
+        "false_accept_rate": len(false_accepts) / negatives if negatives else 0.0,
+        # Among inputs the pre-filter routed itself; the rest of the accepted inputs go to the LLM router
+        "wrong_route_rate": len(wrong_routes) / routed if routed else 0.0,
+        "routed_locally": routed,
+        "defer_rate": deferred / len(examples),
+        "us_per_input": elapsed / len(examples) * 1e6,
+        "false_rejects": false_rejects,
+        "false_accepts": false_accepts,
+        "wrong_routes": wrong_routes,
+    }
+
+
+if __name__ == "__main__":
+    # The model trains on the tuning set; every rate below is measured on the held-out set only
+    model = NaiveBayesModel().fit([(text, label != "other") for text, label in TUNING_EXAMPLES])
+    print(f"Rates on HELD_OUT_EXAMPLES ({len(HELD_OUT_EXAMPLES)} inputs, unseen by rules and model):")
+    for name, candidate in [("rules", None), ("rules + naive Bayes", model)]:
+        for reject_below, accept_above in [(0.02, 0.98), (0.05, 0.95), (0.1, 0.9)]:
+            report = evaluate(Prefilter(reject_below, accept_above, model=candidate), HELD_OUT_EXAMPLES)
+            print(
+                f"{name:<20} reject<{reject_below:<5} accept>{accept_above:<5} "
+                f"false reject {report['false_reject_rate']:.0%}, false accept {report['false_accept_rate']:.0%}, "
+                f"wrong route {report['wrong_route_rate']:.0%} of {report['routed_locally']} routed, deferred {report['defer_rate']:.0%}, "
+                f"{report['us_per_input']:.0f} us/input"
+            )
+            for text in report["false_rejects"] + report["false_accepts"] + report["wrong_routes"]:
+                print(f"    misclassified: {text}")